@@ -3,8 +3,9 @@ Query Processing API Endpoints - Enhanced Version
 نسخه پیشرفته با تحلیل فایل، حافظه کوتاه‌مدت و بلندمدت
 """
 
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Annotated
+import asyncio
+import time
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
@@ -130,6 +131,7 @@ class QueryResponse(BaseModel):
     processing_time_ms: int
     file_analysis: Optional[str] = None  # تحلیل فایل‌ها
     context_used: bool = False  # آیا از حافظه استفاده شد
+    cached: bool = False  # پاسخ از کش (دقیق یا semantic) آمده است
 
 
 @router.post(
@@ -169,7 +171,7 @@ async def process_query_enhanced(
 ) -> QueryResponse:
     """پردازش سوال با قابلیت‌های پیشرفته"""
     
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
     
     try:
         # ========== مرحله 1: احراز هویت ==========
@@ -245,7 +247,7 @@ async def process_query_enhanced(
                     file_analysis=file_analysis
                 )
                 
-                processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
                 
                 return QueryResponse(
                     answer=clarification_response,
@@ -277,7 +279,7 @@ async def process_query_enhanced(
                     assistant_response=response_text
                 )
                 
-                processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
                 
                 return QueryResponse(
                     answer=response_text,
@@ -314,7 +316,7 @@ async def process_query_enhanced(
                     file_analysis=file_analysis
                 )
                 
-                processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
                 
                 return QueryResponse(
                     answer=response_text,
@@ -441,7 +443,7 @@ async def process_query_enhanced(
                     output_tokens=output_tokens
                 )
                 
-                processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
                 
                 return QueryResponse(
                     answer=response_text,
@@ -536,7 +538,9 @@ async def process_query_enhanced(
             rag_query,
             additional_context=llm_context,  # Context کامل برای LLM
             skip_classification=True,  # Classification قبلاً انجام شده
-            image_urls=image_urls_for_rag if image_urls_for_rag else None
+            image_urls=image_urls_for_rag if image_urls_for_rag else None,
+            # llm_context همیشه بلوک «سوال فعلی» را دارد؛ فقط حافظه و فایل پاسخ را شخصی می‌کنند
+            has_personal_context=bool(long_term_memory or short_term_memory or file_analysis)
         )
         
         # ========== مرحله 8: ذخیره پیام‌ها ==========
@@ -581,7 +585,7 @@ async def process_query_enhanced(
         )
         
         # ========== مرحله 10: برگرداندن پاسخ ==========
-        processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
         
         # اضافه کردن اطلاعات دیباگ به پاسخ RAG
         model_display = rag_response.model_used or settings.llm2_model
@@ -613,7 +617,8 @@ async def process_query_enhanced(
             tokens_used=rag_response.total_tokens,
             processing_time_ms=processing_time,
             file_analysis=file_analysis,
-            context_used=bool(long_term_memory or short_term_memory)
+            context_used=bool(long_term_memory or short_term_memory),
+            cached=rag_response.cached
         )
         
     except HTTPException:
@@ -626,6 +631,129 @@ async def process_query_enhanced(
         )
 
 
+class BatchQueryRequest(BaseModel):
+    """Batch query request model (stateless, no conversation or files)."""
+    queries: List[Annotated[str, Field(min_length=1, max_length=settings.max_query_length)]] = Field(
+        ..., min_length=1, max_length=settings.max_batch_queries
+    )
+    language: str = Field(default="fa", pattern="^(fa|en|ar)$")
+    max_results: int = Field(default=settings.rag_max_chunks, ge=1, le=20)
+    filters: Optional[Dict[str, Any]] = None
+    use_cache: bool = True
+    use_reranking: bool = True
+    enable_web_search: Optional[bool] = Field(
+        default=None,
+        description="Web search for each query. If None or True, the classifier decides per query (as in /query); False disables it."
+    )
+
+
+class BatchQueryItem(BaseModel):
+    """Result of a single query in a batch."""
+    query: str
+    answer: str
+    sources: list[str]
+    tokens_used: int
+    processing_time_ms: int
+    cached: bool = False
+    error: Optional[str] = None
+
+
+class BatchQueryResponse(BaseModel):
+    """Batch query response model (results in request order)."""
+    results: List[BatchQueryItem]
+    processing_time_ms: int
+
+
+@router.post(
+    "/batch",
+    response_model=BatchQueryResponse,
+    summary="پردازش دسته‌ای چند سوال",
+    description="""
+    چند سوال مستقل را هم‌زمان از RAG Pipeline عبور می‌دهد و پاسخ‌ها را به همان ترتیب برمی‌گرداند.
+    
+    - بدون مکالمه، حافظه و فایل ضمیمه (مناسب تست و ارزیابی)
+    - کلاسیفیکیشن داخل Pipeline انجام می‌شود و مانند /query جستجوی وب و فیلتر زمانی را تعیین می‌کند
+      (enable_web_search=false جستجوی وب را برای همه سوالات غیرفعال می‌کند)
+    - خطای یک سوال بقیه دسته را متوقف نمی‌کند
+    - هر سوال موفق مانند /query در آمار مصرف کاربر (تعداد سوال و توکن) ثبت می‌شود
+    """
+)
+async def process_query_batch(
+    request: BatchQueryRequest,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id)
+) -> BatchQueryResponse:
+    """پردازش هم‌زمان چند سوال با یک Pipeline مشترک"""
+    
+    start_ns = time.perf_counter_ns()
+    
+    # NOTE: کنترل محدودیت اشتراک سمت سیستم کاربران انجام می‌شود
+    user = await get_or_create_user(db, user_id)
+    
+    pipeline = RAGPipeline()
+    semaphore = asyncio.Semaphore(settings.batch_query_concurrency)
+    
+    async def run_query(text: str):
+        rag_query = RAGQuery(
+            text=text,
+            user_id=str(user.id),
+            language=request.language,
+            max_chunks=request.max_results,
+            filters=request.filters,
+            use_cache=request.use_cache,
+            use_reranking=request.use_reranking,
+            # None: Pipeline بعد از کلاسیفیکیشن بر اساس needs_web_search تصمیم می‌گیرد
+            enable_web_search=False if request.enable_web_search is False else None
+        )
+        
+        async with semaphore:
+            try:
+                rag_response = await pipeline.process(rag_query)
+            except Exception as e:
+                logger.error("Batch query failed", query=text[:100], error=str(e))
+                return BatchQueryItem(
+                    query=text,
+                    answer="",
+                    sources=[],
+                    tokens_used=0,
+                    processing_time_ms=0,
+                    error=str(e)
+                ), None
+        
+        return BatchQueryItem(
+            query=text,
+            answer=rag_response.answer,
+            sources=rag_response.sources,
+            tokens_used=rag_response.total_tokens,
+            processing_time_ms=rag_response.processing_time_ms,
+            cached=rag_response.cached
+        ), rag_response
+    
+    outcomes = await asyncio.gather(*(run_query(q) for q in request.queries))
+    results = [item for item, _ in outcomes]
+    
+    # ثبت مصرف همانند save_conversation_messages (یک commit برای کل دسته)
+    answered = [rag_response for _, rag_response in outcomes if rag_response is not None]
+    if answered:
+        for rag_response in answered:
+            user.increment_query_count()
+            user.total_tokens_used += rag_response.total_tokens
+            user.total_input_tokens += rag_response.input_tokens
+            user.total_output_tokens += rag_response.output_tokens
+        await db.commit()
+    
+    processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
+    
+    logger.info(
+        "Batch query processed",
+        count=len(results),
+        failed=sum(1 for r in results if r.error),
+        processing_time_ms=processing_time
+    )
+    
+    return BatchQueryResponse(results=results, processing_time_ms=processing_time)
+
+
 async def _extract_and_save_user_memory(
     db: AsyncSession,
     user_id: str,
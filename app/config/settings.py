@@ -69,6 +69,8 @@ class Settings(BaseSettings):
     qdrant_api_key: Optional[str] = Field(default=None)
     qdrant_collection: str = Field(default="legal_documents")
     qdrant_use_grpc: bool = Field(default=True)
+    qdrant_indexing_threshold: int = Field(default=20000, ge=0)
+    qdrant_memmap_threshold: int = Field(default=50000, ge=0)
     
     # Redis
     redis_url: RedisDsn
@@ -81,6 +83,8 @@ class Settings(BaseSettings):
     cache_ttl_query: int = Field(default=7200, ge=0)
     cache_ttl_embedding: int = Field(default=86400, ge=0)
     semantic_cache_threshold: float = Field(default=0.95, ge=0.0, le=1.0)
+    enable_semantic_cache: bool = Field(default=False, description="Reuse cached answers for semantically similar queries")
+    semantic_cache_max_entries: int = Field(default=1000, ge=1, description="Max indexed queries per semantic cache scope")
     
     # Celery
     celery_broker_url: RedisDsn
@@ -245,6 +249,8 @@ class Settings(BaseSettings):
     max_concurrent_requests: int = Field(default=100, ge=1)
     max_history_length: int = Field(default=50, ge=1)
     max_query_length: int = Field(default=2000, ge=100)
+    max_batch_queries: int = Field(default=20, ge=1, description="Max queries per /query/batch request")
+    batch_query_concurrency: int = Field(default=4, ge=1, description="Concurrent pipeline runs per /query/batch request")
     request_timeout: int = Field(default=60, ge=1)
     
     @property
@@ -4,7 +4,7 @@ Implementation for any OpenAI-compatible API (OpenAI, Groq, Together.ai, etc.)
 Uses Responses API for GPT-5 models
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 import asyncio
 
 import openai
@@ -198,6 +198,50 @@ class OpenAIProvider(BaseLLM):
             # Fallback to approximation
             return len(text) // 4
     
+    def _build_responses_params(
+        self,
+        messages: List[Message],
+        reasoning_effort: str = "low",
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build request parameters for the Responses API."""
+        max_tokens_value = kwargs.get("max_tokens", self.config.max_tokens)
+        
+        # اگر input_content مستقیم داده شده، از آن استفاده کن (مانند فایل تست)
+        if "input_content" in kwargs:
+            input_content = kwargs["input_content"]
+        else:
+            # Convert messages to input format for Responses API
+            formatted_messages = self.prepare_messages(messages)
+            
+            # Build input content
+            input_parts = []
+            for msg in formatted_messages:
+                role = msg["role"]
+                content = msg["content"]
+                if role == "system":
+                    input_parts.append(content)
+                elif role == "user":
+                    input_parts.append(f"\n---\n\n{content}")
+                elif role == "assistant":
+                    input_parts.append(f"\n[Assistant]: {content}")
+            
+            input_content = "\n".join(input_parts)
+        
+        params = {
+            "model": self.config.model,
+            "input": input_content,
+            "max_output_tokens": max_tokens_value,
+        }
+        
+        # فقط مدل‌های gpt-5 از reasoning پشتیبانی می‌کنند
+        # برای مدل‌های قدیمی‌تر مثل gpt-4o-mini، بدون reasoning
+        model_supports_reasoning = "gpt-5" in self.config.model.lower() or "o1" in self.config.model.lower()
+        if model_supports_reasoning:
+            params["reasoning"] = {"effort": reasoning_effort}
+        
+        return params
+    
     async def generate_responses_api(
         self,
         messages: List[Message],
@@ -217,55 +261,14 @@ class OpenAIProvider(BaseLLM):
             LLMResponse with content and usage info
         """
         try:
-            max_tokens_value = kwargs.get("max_tokens", self.config.max_tokens)
-            
-            # اگر input_content مستقیم داده شده، از آن استفاده کن (مانند فایل تست)
-            if "input_content" in kwargs:
-                input_content = kwargs["input_content"]
-            else:
-                # Convert messages to input format for Responses API
-                formatted_messages = self.prepare_messages(messages)
-                
-                # Build input content
-                input_parts = []
-                for msg in formatted_messages:
-                    role = msg["role"]
-                    content = msg["content"]
-                    if role == "system":
-                        input_parts.append(content)
-                    elif role == "user":
-                        input_parts.append(f"\n---\n\n{content}")
-                    elif role == "assistant":
-                        input_parts.append(f"\n[Assistant]: {content}")
-                
-                input_content = "\n".join(input_parts)
+            params = self._build_responses_params(messages, reasoning_effort, **kwargs)
             
             # Run sync client in thread pool to avoid blocking
             loop = asyncio.get_event_loop()
-            
-            # فقط مدل‌های gpt-5 از reasoning پشتیبانی می‌کنند
-            model_supports_reasoning = "gpt-5" in self.config.model.lower() or "o1" in self.config.model.lower()
-            
-            if model_supports_reasoning:
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: self.sync_client.responses.create(
-                        model=self.config.model,
-                        input=input_content,
-                        reasoning={"effort": reasoning_effort},
-                        max_output_tokens=max_tokens_value,
-                    )
-                )
-            else:
-                # برای مدل‌های قدیمی‌تر مثل gpt-4o-mini، بدون reasoning
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: self.sync_client.responses.create(
-                        model=self.config.model,
-                        input=input_content,
-                        max_output_tokens=max_tokens_value,
-                    )
-                )
+            response = await loop.run_in_executor(
+                None,
+                lambda: self.sync_client.responses.create(**params)
+            )
             
             # Extract response text
             content = extract_responses_api_text(response)
@@ -290,6 +293,83 @@ class OpenAIProvider(BaseLLM):
             logger.error(f"OpenAI Responses API failed: {e}")
             raise
     
+    async def generate_responses_api_stream(
+        self,
+        messages: List[Message],
+        on_delta: Callable[[str], None],
+        reasoning_effort: str = "low",
+        **kwargs
+    ) -> LLMResponse:
+        """
+        Generate a response using Responses API with streaming.
+        
+        Args:
+            messages: List of messages (will be converted to input format)
+            on_delta: Called with each text fragment as soon as it arrives
+                (e.g. to forward tokens or measure time-to-first-token)
+            reasoning_effort: "low", "medium", or "high"
+            **kwargs: Additional parameters (input_content for direct input)
+        
+        Returns:
+            LLMResponse with the full content and usage info
+        
+        Raises:
+            Exception: If the response fails, the stream reports an error, or
+                the stream ends without a completed/incomplete event
+        """
+        try:
+            params = self._build_responses_params(messages, reasoning_effort, **kwargs)
+            
+            parts = []
+            final_response = None
+            finish_reason = None
+            
+            stream = await self.client.responses.create(stream=True, **params)
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    parts.append(event.delta)
+                    on_delta(event.delta)
+                elif event.type == "response.completed":
+                    final_response = event.response
+                    finish_reason = "stop"
+                elif event.type == "response.incomplete":
+                    # پاسخ ناقص (مثلاً رسیدن به max_output_tokens) هنوز متن و مصرف توکن دارد
+                    final_response = event.response
+                    details = getattr(final_response, "incomplete_details", None)
+                    reason = getattr(details, "reason", None)
+                    finish_reason = "length" if reason == "max_output_tokens" else (reason or "incomplete")
+                elif event.type == "response.failed":
+                    error = getattr(event.response, "error", None)
+                    message = getattr(error, "message", None) or "response failed"
+                    raise Exception(f"Responses API stream failed: {message}")
+                elif event.type == "error":
+                    raise Exception(f"Responses API stream error: {event.message}")
+            
+            if final_response is None:
+                raise Exception("Responses API stream ended without a terminal event")
+            
+            input_tokens, output_tokens = extract_responses_api_tokens(final_response)
+            
+            return LLMResponse(
+                content=extract_responses_api_text(final_response) or "".join(parts),
+                model=self.config.model,
+                usage={
+                    "prompt_tokens": input_tokens,
+                    "completion_tokens": output_tokens,
+                    "total_tokens": input_tokens + output_tokens,
+                },
+                finish_reason=finish_reason,
+                metadata={
+                    "api_type": "responses",
+                    "reasoning_effort": reasoning_effort,
+                    "streamed": True,
+                }
+            )
+            
+        except Exception as e:
+            logger.error(f"OpenAI Responses API streaming failed: {e}")
+            raise
+    
     async def generate_with_web_search(
         self,
         messages: List[Message],
@@ -7,6 +7,7 @@ from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import asyncio
+import time
 import hashlib
 import json
 import re
@@ -16,9 +17,10 @@ import pytz
 import jdatetime
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from app.services.qdrant_service import QdrantService
+from app.services.qdrant_service import QdrantService, vector_field_for_dim
 from app.services.embedding_service import get_embedding_service
 from app.services.reranker_service import get_reranker
+from app.services.semantic_cache import SemanticCache
 from app.llm.base import Message
 from app.llm.classifier import QueryClassifier
 from app.llm.factory import create_llm2_pro
@@ -45,7 +47,7 @@ class RAGQuery:
     use_cache: bool = True
     use_reranking: bool = True
     user_preferences: Optional[Dict[str, Any]] = None
-    enable_web_search: bool = False
+    enable_web_search: Optional[bool] = False  # None: تصمیم با classifier داخل Pipeline
     # فیلتر زمانی برای قوانین
     temporal_context: Optional[str] = None  # "current" یا "past" یا None
     target_date: Optional[str] = None  # تاریخ هدف برای گذشته (YYYY-MM-DD)
@@ -93,6 +95,7 @@ class RAGPipeline:
         self.llm = create_llm2_pro()
         self.classifier = QueryClassifier()  # LLM برای دسته‌بندی سوالات
         self.reranker = get_reranker()  # Initialize Cohere reranker if configured
+        self.semantic_cache = SemanticCache() if settings.enable_semantic_cache else None
         if self.reranker:
             logger.info("RAG Pipeline initialized with LLM2 (Pro) and Cohere Reranker")
         else:
@@ -103,7 +106,8 @@ class RAGPipeline:
         query: RAGQuery, 
         additional_context: str = None, 
         skip_classification: bool = False,
-        image_urls: List[str] = None
+        image_urls: List[str] = None,
+        has_personal_context: Optional[bool] = None
     ) -> RAGResponse:
         """
         Process a query through the RAG pipeline.
@@ -113,11 +117,13 @@ class RAGPipeline:
             additional_context: Additional context for LLM (memory, file analysis, etc.)
             skip_classification: Skip classification if already done in query endpoint
             image_urls: List of presigned URLs for images to send to LLM
+            has_personal_context: Whether additional_context carries conversation memory or
+                file content (default: any additional_context counts)
             
         Returns:
             RAG response with answer and sources
         """
-        start_time = datetime.utcnow()
+        start_ns = time.perf_counter_ns()
         
         try:
             # Step 0: Classify query using LLM (if enabled and not skipped)
@@ -131,6 +137,15 @@ class RAGPipeline:
                     category=classification.category,
                     confidence=classification.confidence
                 )
+                
+                # مانند /query: اگر درخواست تصمیم web search را باز گذاشته، classifier تعیین می‌کند
+                if query.enable_web_search is None:
+                    query.enable_web_search = classification.needs_web_search
+                if query.temporal_context is None:
+                    query.temporal_context = classification.temporal_context
+                    query.target_date = classification.target_date
+            
+            query.enable_web_search = bool(query.enable_web_search)
             
             # دسته‌بندی‌های مختلف:
             # 1. invalid_no_file, invalid_with_file → پاسخ مستقیم از کلاسیفیکیشن (direct_response)
@@ -140,7 +155,7 @@ class RAGPipeline:
             invalid_categories = ["invalid_no_file", "invalid_with_file"]
             if classification and classification.category in invalid_categories:
                 # پاسخ مستقیم برای سوالات نامعتبر
-                processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
                 return RAGResponse(
                     answer=classification.direct_response or "لطفاً سوال خود را واضح‌تر بیان کنید.",
                     chunks=[],
@@ -153,10 +168,9 @@ class RAGPipeline:
             
             if classification and classification.category == "general":
                 # سوالات عمومی → ارسال به LLM1 بدون RAG
-                processing_time_start = datetime.utcnow()
                 try:
                     llm_response = await self._generate_general_response(query.text)
-                    processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                    processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
                     return RAGResponse(
                         answer=llm_response,
                         chunks=[],
@@ -174,11 +188,22 @@ class RAGPipeline:
             # فقط برای سوالات واقعی ادامه می‌دهیم
             
             # Check cache if enabled
+            query_text_embedding = None
             if query.use_cache:
                 cached_response = await self._check_cache(query)
                 if cached_response:
                     cached_response.cached = True
                     return cached_response
+                
+                # Semantic cache: همان سوال با عبارت‌بندی متفاوت
+                # حافظه مکالمه و فایل‌های پیوست پاسخ را تغییر می‌دهند و در embedding سوال دیده نمی‌شوند
+                if has_personal_context is None:
+                    has_personal_context = bool(additional_context)
+                if self.semantic_cache and not has_personal_context and not image_urls:
+                    query_text_embedding = await self._generate_embedding(query.text)
+                    cached_response = await self._check_semantic_cache(query, query_text_embedding)
+                    if cached_response:
+                        return cached_response
             
             # Step 1: Query understanding and enhancement
             enhanced_query = await self._enhance_query(query)
@@ -296,9 +321,7 @@ class RAGPipeline:
                     logger.warning("LLM did not specify used sources, keeping all")
             
             # Calculate processing time
-            processing_time = int(
-                (datetime.utcnow() - start_time).total_seconds() * 1000
-            )
+            processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
             
             # Create response
             response = RAGResponse(
@@ -316,6 +339,12 @@ class RAGPipeline:
             # Cache response if enabled
             if query.use_cache:
                 await self._cache_response(query, response)
+                if query_text_embedding is not None:
+                    await self.semantic_cache.store(
+                        self._generate_cache_scope(query),
+                        self._generate_cache_key(query),
+                        query_text_embedding
+                    )
             
             return response
             
@@ -1083,23 +1112,19 @@ class RAGPipeline:
     
     def _get_vector_field(self, dim: int) -> str:
         """Get vector field name based on dimension."""
-        if dim <= 512:
-            return "small"
-        elif dim <= 768:
-            return "medium"
-        elif dim <= 1024:
-            return "large"  # e5-large, bge-m3
-        elif dim <= 1536:
-            return "xlarge"  # OpenAI ada-002, text-embedding-3-small
-        else:
-            return "default"  # 3072
+        return vector_field_for_dim(dim)
     
-    async def _check_cache(self, query: RAGQuery) -> Optional[RAGResponse]:
+    async def _check_cache(
+        self,
+        query: RAGQuery,
+        cache_key: Optional[str] = None
+    ) -> Optional[RAGResponse]:
         """
         Check if query result is cached.
         
         Args:
             query: Query to check
+            cache_key: Cache key to read (default: exact-match key of query)
             
         Returns:
             Cached response if available
@@ -1108,7 +1133,7 @@ class RAGPipeline:
             redis = await get_redis_client()
             
             # Generate cache key
-            cache_key = self._generate_cache_key(query)
+            cache_key = cache_key or self._generate_cache_key(query)
             
             # Check Redis cache
             cached = await redis.get(cache_key)
@@ -1137,6 +1162,36 @@ class RAGPipeline:
         
         return None
     
+    async def _check_semantic_cache(
+        self,
+        query: RAGQuery,
+        query_embedding: List[float]
+    ) -> Optional[RAGResponse]:
+        """
+        Check for a cached response to a semantically similar query.
+        
+        Args:
+            query: Query to check
+            query_embedding: Embedding of the original query text
+            
+        Returns:
+            Cached response if a similar enough query was answered before
+        """
+        scope = self._generate_cache_scope(query)
+        match = await self.semantic_cache.lookup(scope, query_embedding)
+        if not match:
+            return None
+        
+        cache_key, similarity = match
+        cached_response = await self._check_cache(query, cache_key=cache_key)
+        if not cached_response:
+            # پاسخ منقضی شده ولی ایندکس هنوز به آن اشاره می‌کند
+            await self.semantic_cache.discard(scope, cache_key)
+            return None
+        
+        logger.info("Semantic cache hit", query=query.text[:100], similarity=round(similarity, 4))
+        return cached_response
+    
     async def _cache_response(
         self,
         query: RAGQuery,
@@ -1186,17 +1241,24 @@ class RAGPipeline:
         except Exception as e:
             logger.warning(f"Cache save failed: {e}")
     
-    def _generate_cache_key(self, query: RAGQuery) -> str:
-        """Generate cache key for query."""
-        # Create a unique key based on query parameters
-        key_parts = [
-            query.text.lower(),
+    def _generate_cache_scope(self, query: RAGQuery) -> str:
+        """Query parameters (other than text) a cached answer is valid for."""
+        scope_parts = [
+            self.llm.config.model,  # answers from a previous model are not reused
             query.language,
             str(query.max_chunks),
             str(query.filters) if query.filters else "",
+            query.temporal_context or "",
+            query.target_date or "",
+            "web" if query.enable_web_search else "",
         ]
         
-        key_string = "|".join(key_parts)
+        return "|".join(scope_parts)
+    
+    def _generate_cache_key(self, query: RAGQuery) -> str:
+        """Generate cache key for query."""
+        # Create a unique key based on query parameters
+        key_string = f"{query.text.lower()}|{self._generate_cache_scope(query)}"
         key_hash = hashlib.md5(key_string.encode()).hexdigest()
         
         return f"rag:cache:{key_hash}"
@@ -23,6 +23,28 @@ from app.config.settings import settings
 
 logger = structlog.get_logger()
 
+# Named vector fields and their sizes; the field is chosen by embedding dimension
+VECTOR_FIELD_SIZES = {
+    "small": 512,     # Smaller models
+    "medium": 768,    # BERT-based models, e5-base (legacy)
+    "large": 1024,    # e5-large, bge-m3
+    "xlarge": 1536,   # OpenAI ada-002, text-embedding-3-small
+    "default": 3072,  # For large embedding models (e.g., text-embedding-3-large)
+}
+
+
+def vector_field_for_dim(dim: int) -> str:
+    """Get vector field name based on dimension."""
+    for field, size in VECTOR_FIELD_SIZES.items():
+        if dim <= size:
+            return field
+    return "default"
+
+
+def default_vector_sizes() -> Dict[str, int]:
+    """Vector field for the configured embedding model (settings.embedding_dim)."""
+    return {vector_field_for_dim(settings.embedding_dim): settings.embedding_dim}
+
 
 class QdrantService:
     """Service for interacting with Qdrant vector database."""
@@ -76,36 +98,8 @@ class QdrantService:
             collection_names = [c.name for c in collections.collections]
 
             if self.collection_name not in collection_names:
-                # Create collection with multiple vector sizes support
-                await self.client.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config={
-                        "default": VectorParams(
-                            size=3072,  # For large embedding models (e.g., text-embedding-3-large)
-                            distance=Distance.COSINE,
-                        ),
-                        "small": VectorParams(
-                            size=512,  # Smaller models
-                            distance=Distance.COSINE,
-                        ),
-                        "medium": VectorParams(
-                            size=768,  # BERT-based models, e5-base (legacy)
-                            distance=Distance.COSINE,
-                        ),
-                        "large": VectorParams(
-                            size=1024,  # e5-large, bge-m3
-                            distance=Distance.COSINE,
-                        ),
-                        "xlarge": VectorParams(
-                            size=1536,  # OpenAI ada-002, text-embedding-3-small
-                            distance=Distance.COSINE,
-                        ),
-                    },
-                    optimizers_config=OptimizersConfigDiff(
-                        indexing_threshold=20000,
-                        memmap_threshold=50000,
-                    ),
-                )
+                # sync هر بعدی را می‌پذیرد؛ پس همه فیلدهای برداری ساخته می‌شوند
+                await self.create_collection(dict(VECTOR_FIELD_SIZES))
                 logger.info(f"Created Qdrant collection: {self.collection_name}")
 
                 # Create indexes for better performance
@@ -118,6 +112,38 @@ class QdrantService:
             logger.error(f"Failed to initialize Qdrant collection (will continue without Qdrant ready): {e}")
             return
     
+    async def create_collection(
+        self,
+        vectors: Optional[Dict[str, int]] = None,
+        indexing_threshold: Optional[int] = None,
+        memmap_threshold: Optional[int] = None
+    ):
+        """
+        Create the collection with only the requested named vectors.
+        
+        Args:
+            vectors: Mapping of vector field name to size (default: default_vector_sizes())
+            indexing_threshold: Optimizer indexing threshold (default: settings.qdrant_indexing_threshold)
+            memmap_threshold: Optimizer memmap threshold (default: settings.qdrant_memmap_threshold)
+        """
+        vectors = vectors or default_vector_sizes()
+        
+        await self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config={
+                name: VectorParams(size=size, distance=Distance.COSINE)
+                for name, size in vectors.items()
+            },
+            optimizers_config=OptimizersConfigDiff(
+                indexing_threshold=(
+                    settings.qdrant_indexing_threshold if indexing_threshold is None else indexing_threshold
+                ),
+                memmap_threshold=(
+                    settings.qdrant_memmap_threshold if memmap_threshold is None else memmap_threshold
+                ),
+            ),
+        )
+    
     async def create_indexes(self):
         """Create payload indexes for filtering."""
         try:
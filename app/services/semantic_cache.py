@@ -0,0 +1,289 @@
+"""
+Semantic Cache Service
+Reuses cached RAG responses for queries that are worded differently but mean the same thing
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import base64
+import hashlib
+
+import numpy as np
+import structlog
+
+from app.core.dependencies import get_redis_client
+from app.config.settings import settings
+
+logger = structlog.get_logger()
+
+
+class _ScopeMatrix:
+    """Process-local copy of one scope's embedding index."""
+
+    __slots__ = ("generation", "offset", "keys", "rows", "matrix")
+
+    def __init__(self, generation: str, offset: int):
+        self.generation = generation
+        self.offset = offset
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.matrix: Optional[np.ndarray] = None
+
+    def extend(
+        self,
+        cache_keys: List[str],
+        vectors: List[np.ndarray],
+        offset: Optional[int] = None
+    ):
+        """
+        Insert or replace the vectors of a batch of cache keys.
+
+        All-or-nothing: on error the matrix, rows and offset are left as they were.
+        """
+        # یک کلید ممکن است در یک دسته چند بار بیاید (store هم‌زمان)؛ آخرین بردار معتبر است
+        batch = dict(zip(cache_keys, vectors))
+
+        rows = dict(self.rows)
+        keys = list(self.keys)
+        matrix = None if self.matrix is None else self.matrix.copy()
+        new_vectors = []
+        for cache_key, vector in batch.items():
+            row = rows.get(cache_key)
+            if row is not None:
+                matrix[row] = vector
+                continue
+            rows[cache_key] = len(keys)
+            keys.append(cache_key)
+            new_vectors.append(vector)
+
+        if new_vectors:
+            block = np.stack(new_vectors)
+            matrix = block if matrix is None else np.vstack([matrix, block])
+
+        self.rows, self.keys, self.matrix = rows, keys, matrix
+        if offset is not None:
+            self.offset = offset
+
+
+class SemanticCache:
+    """
+    ایندکس embedding سوالات پاسخ داده شده در Redis.
+
+    برای هر scope (زبان، تعداد chunk و فیلترها) یک Redis hash نگه داشته می‌شود که
+    کلید کش دقیق پاسخ (rag:cache:*) را به embedding نرمال‌شده سوال نگاشت می‌کند.
+    خود پاسخ‌ها همان ورودی‌های کش دقیق هستند و TTL آنها را تعیین می‌کند.
+
+    هر process یک کپی محلی از ماتریس embedding ها نگه می‌دارد. ورودی‌های جدید از
+    یک لیست append-only خوانده می‌شوند و فقط بعد از حذف (تغییر generation) کل
+    ایندکس دوباره خوانده می‌شود؛ بنابراین مسیر داغ فقط یک round-trip کوچک دارد.
+    """
+
+    INDEX_PREFIX = "rag:semcache"
+    MAX_LOCAL_SCOPES = 16
+
+    # مشترک بین همه نمونه‌ها (RAGPipeline برای هر درخواست ساخته می‌شود)
+    _local: "OrderedDict[str, _ScopeMatrix]" = OrderedDict()
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit (default: settings.semantic_cache_threshold)
+            max_entries: Maximum indexed queries per scope (default: settings.semantic_cache_max_entries)
+        """
+        self.threshold = settings.semantic_cache_threshold if threshold is None else threshold
+        self.max_entries = max_entries or settings.semantic_cache_max_entries
+
+    def _index_key(self, scope: str) -> str:
+        """Redis key of the embedding index for a scope."""
+        return f"{self.INDEX_PREFIX}:{hashlib.md5(scope.encode()).hexdigest()}"
+
+    @staticmethod
+    def _encode(embedding: List[float]) -> str:
+        """L2-normalize and pack an embedding as base64 float32."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        return base64.b64encode(vector.tobytes()).decode("ascii")
+
+    @staticmethod
+    def _decode(value) -> np.ndarray:
+        """Unpack a stored embedding."""
+        return np.frombuffer(base64.b64decode(value), dtype=np.float32)
+
+    @staticmethod
+    def _str(value) -> str:
+        """Redis value as str (client may or may not decode responses)."""
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def _sync(self, index_key: str) -> Optional[_ScopeMatrix]:
+        """
+        Bring the process-local matrix of a scope up to date.
+
+        Only entries appended since the last sync are fetched; the whole
+        index is re-read only after entries were removed.
+        """
+        redis = await get_redis_client()
+
+        pipe = redis.pipeline()
+        pipe.get(f"{index_key}:gen")
+        pipe.llen(f"{index_key}:log")
+        generation, log_len = await pipe.execute()
+        generation = self._str(generation) or "0"
+
+        local = self._local.get(index_key)
+        if local is None or local.generation != generation or log_len < local.offset:
+            entries = await redis.hgetall(index_key)
+            local = _ScopeMatrix(generation, log_len)
+            local.extend(
+                [self._str(k) for k in entries.keys()],
+                [self._decode(v) for v in entries.values()]
+            )
+        elif log_len > local.offset:
+            new_keys = [self._str(k) for k in await redis.lrange(f"{index_key}:log", local.offset, log_len - 1)]
+            values = await redis.hmget(index_key, new_keys)
+            found = [(k, v) for k, v in zip(new_keys, values) if v is not None]
+            local.extend([k for k, _ in found], [self._decode(v) for _, v in found], offset=log_len)
+
+        self._local[index_key] = local
+        self._local.move_to_end(index_key)
+        while len(self._local) > self.MAX_LOCAL_SCOPES:
+            self._local.popitem(last=False)
+        return local
+
+    async def lookup(
+        self,
+        scope: str,
+        embedding: List[float]
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar cached query in a scope.
+
+        Args:
+            scope: Cache scope (query parameters other than text)
+            embedding: Embedding of the incoming query text
+
+        Returns:
+            (cache_key, similarity) of the best match above threshold, or None
+        """
+        index_key = self._index_key(scope)
+        try:
+            local = await self._sync(index_key)
+            if local is None or local.matrix is None:
+                return None
+
+            query_vector = self._decode(self._encode(embedding))
+
+            if local.matrix.shape[1] != query_vector.shape[0]:
+                # مدل embedding عوض شده؛ ایندکس قدیمی قابل مقایسه نیست
+                await self._reset(index_key)
+                return None
+
+            # بردارها نرمال هستند، پس ضرب داخلی همان cosine similarity است
+            scores = local.matrix @ query_vector
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+
+            if similarity < self.threshold:
+                return None
+
+            return local.keys[best], similarity
+
+        except ValueError as e:
+            # ابعاد ناهمسان بین ورودی‌ها
+            logger.warning(f"Semantic cache index inconsistent, resetting: {e}")
+            await self._reset(index_key)
+            return None
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+    async def store(
+        self,
+        scope: str,
+        cache_key: str,
+        embedding: List[float]
+    ):
+        """
+        Index a cached response by its query embedding.
+
+        Args:
+            scope: Cache scope (query parameters other than text)
+            cache_key: Exact-match cache key the response is stored under
+            embedding: Embedding of the query text
+        """
+        try:
+            redis = await get_redis_client()
+            index_key = self._index_key(scope)
+
+            if await redis.hlen(index_key) >= self.max_entries:
+                await self._prune(index_key)
+                if await redis.hlen(index_key) >= self.max_entries:
+                    return
+
+            ttl = settings.cache_ttl_query
+            pipe = redis.pipeline()
+            pipe.hset(index_key, cache_key, self._encode(embedding))
+            pipe.rpush(f"{index_key}:log", cache_key)
+            pipe.expire(index_key, ttl)
+            pipe.expire(f"{index_key}:log", ttl)
+            pipe.expire(f"{index_key}:gen", ttl)
+            _, log_len, *_ = await pipe.execute()
+
+            if log_len > 2 * self.max_entries:
+                # لیست فقط برای همگام‌سازی است؛ کوتاه کردن آن یعنی بازخوانی کامل
+                await self._bump_generation(index_key)
+
+        except Exception as e:
+            logger.warning(f"Semantic cache save failed: {e}")
+
+    async def discard(self, scope: str, cache_key: str):
+        """Remove an index entry whose cached response has expired."""
+        try:
+            redis = await get_redis_client()
+            index_key = self._index_key(scope)
+            await redis.hdel(index_key, cache_key)
+            await self._bump_generation(index_key)
+        except Exception as e:
+            logger.warning(f"Semantic cache discard failed: {e}")
+
+    async def _bump_generation(self, index_key: str):
+        """Invalidate every process-local copy of a scope after removals."""
+        redis = await get_redis_client()
+        pipe = redis.pipeline()
+        pipe.delete(f"{index_key}:log")
+        pipe.incr(f"{index_key}:gen")
+        pipe.expire(f"{index_key}:gen", settings.cache_ttl_query)
+        await pipe.execute()
+
+    async def _reset(self, index_key: str):
+        """Drop a scope entirely (e.g. after an embedding model change)."""
+        self._local.pop(index_key, None)
+        try:
+            redis = await get_redis_client()
+            await redis.delete(index_key, f"{index_key}:log")
+            await redis.incr(f"{index_key}:gen")
+        except Exception as e:
+            logger.warning(f"Semantic cache reset failed: {e}")
+
+    async def _prune(self, index_key: str):
+        """Drop index entries whose cached responses have expired."""
+        redis = await get_redis_client()
+        cache_keys = await redis.hkeys(index_key)
+
+        pipe = redis.pipeline()
+        for cache_key in cache_keys:
+            pipe.exists(cache_key)
+        alive = await pipe.execute()
+
+        expired = [k for k, exists in zip(cache_keys, alive) if not exists]
+        if expired:
+            await redis.hdel(index_key, *expired)
+            await self._bump_generation(index_key)
+            logger.info("Semantic cache pruned", removed=len(expired))
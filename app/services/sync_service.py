@@ -7,7 +7,7 @@ from typing import Dict, Any
 from datetime import datetime
 import structlog
 
-from app.services.qdrant_service import QdrantService
+from app.services.qdrant_service import QdrantService, vector_field_for_dim
 from app.core.dependencies import get_redis_client
 
 logger = structlog.get_logger()
@@ -22,16 +22,7 @@ class SyncService:
     
     def _get_vector_field_by_dim(self, dim: int) -> str:
         """Determine vector field name based on dimension."""
-        if dim <= 512:
-            return "small"
-        elif dim <= 768:
-            return "medium"
-        elif dim <= 1024:
-            return "large"  # e5-large, bge-m3
-        elif dim <= 1536:
-            return "xlarge"  # OpenAI ada-002, text-embedding-3-small
-        else:
-            return "default"  # 3072
+        return vector_field_for_dim(dim)
     
     
     async def get_sync_status(self) -> Dict[str, Any]:
@@ -494,6 +494,8 @@ QDRANT_GRPC_PORT=7334
 QDRANT_API_KEY=""
 QDRANT_COLLECTION="legal_documents"
 QDRANT_USE_GRPC=false
+QDRANT_INDEXING_THRESHOLD=20000
+QDRANT_MEMMAP_THRESHOLD=50000
 
 # Redis
 REDIS_URL="redis://:${REDIS_PASSWORD}@redis-core:6379/0"
@@ -506,6 +508,8 @@ CACHE_TTL_DEFAULT=3600
 CACHE_TTL_QUERY=7200
 CACHE_TTL_EMBEDDING=86400
 SEMANTIC_CACHE_THRESHOLD=0.95
+ENABLE_SEMANTIC_CACHE=false
+SEMANTIC_CACHE_MAX_ENTRIES=1000
 
 # Celery
 CELERY_BROKER_URL="redis://:${REDIS_PASSWORD}@redis-core:6379/1"
@@ -610,6 +614,8 @@ USERS_API_KEY="${USERS_API_KEY}"
 MAX_CONCURRENT_REQUESTS=100
 MAX_HISTORY_LENGTH=50
 MAX_QUERY_LENGTH=2000
+MAX_BATCH_QUERIES=20
+BATCH_QUERY_CONCURRENCY=4
 REQUEST_TIMEOUT=60
 
 # Temporary File Storage
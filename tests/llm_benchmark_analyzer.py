@@ -4,13 +4,28 @@
 خواندن فایل‌های نتایج و تولید گزارش‌های تحلیلی
 """
 
-import json
 import sys
 from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 import argparse
 
+import orjson
+import pandas as pd
+
+
+# قالب سطرهای جداول گزارش Markdown
+PROVIDER_ROW_TMPL = "| {key} | {total} | {success} | {failed} | {avg}ms | {tokens} | {rate:.1f}% |"
+MODEL_ROW_TMPL = "| {key} | {total} | {success} | {avg}ms | {p50}ms | {p95}ms | {p99}ms | {min}ms | {max}ms | {tokens} | {rate:.1f}% |"
+MODEL_ROW_TTFT_TMPL = "| {key} | {total} | {success} | {avg}ms | {p50}ms | {p95}ms | {p99}ms | {min}ms | {max}ms | {ttft50}ms | {ttft95}ms | {tokens} | {rate:.1f}% |"
+CATEGORY_ROW_TMPL = "| {key} | {total} | {success} | {avg}ms | {tokens} | {rate:.1f}% |"
+
+
+def _join_rows(rows) -> str:
+    """اتصال سطرهای جدول در یک رشته"""
+    rows = "\n".join(rows)
+    return rows + "\n" if rows else ""
+
 
 class LLMBenchmarkAnalyzer:
     """کلاس تحلیل نتایج benchmark"""
@@ -19,6 +34,7 @@ class LLMBenchmarkAnalyzer:
         self.results_dir = Path(results_dir)
         self.results = []
         self.summary = {}
+        self._cache: Dict[str, Any] = {}
         
     def load_results(self, result_file: str = None):
         """بارگذاری نتایج از فایل"""
@@ -26,7 +42,7 @@ class LLMBenchmarkAnalyzer:
         if result_file:
             file_path = Path(result_file)
         else:
-            result_files = sorted(self.results_dir.glob("results_*.json"))
+            result_files = sorted(self.results_dir.glob("results_*.json*"))
             if not result_files:
                 print("❌ No result files found!")
                 return False
@@ -34,12 +50,24 @@ class LLMBenchmarkAnalyzer:
         
         print(f"📂 Loading results from: {file_path}")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            self.results = data.get('results', [])
-            self.config = data.get('config', 'unknown')
-            self.llm_type = data.get('llm_type', 'unknown')
-            self.timestamp = data.get('timestamp', 'unknown')
+        if file_path.suffix == '.jsonl':
+            # NDJSON: خط اول مشخصات اجرا و بقیه خطوط نتایج
+            with open(file_path, 'rb') as f:
+                data = orjson.loads(f.readline())
+                data['results'] = [orjson.loads(line) for line in f if line.strip()]
+        else:
+            data = orjson.loads(file_path.read_bytes())
+        
+        self.results = data.get('results', [])
+        self._cache.clear()
+        
+        for result in self.results:
+            for field in ('provider', 'model', 'llm_type', 'category'):
+                if isinstance(result.get(field), str):
+                    result[field] = sys.intern(result[field])
+        self.config = data.get('config', 'unknown')
+        self.llm_type = data.get('llm_type', 'unknown')
+        self.timestamp = data.get('timestamp', 'unknown')
         
         print(f"✅ Loaded {len(self.results)} test results")
         return True
@@ -58,128 +86,133 @@ class LLMBenchmarkAnalyzer:
         
         print(f"📂 Loading summary from: {file_path}")
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            self.summary = data.get('summary', {})
+        data = orjson.loads(file_path.read_bytes())
+        self.summary = data.get('summary', {})
         
         print(f"✅ Loaded summary for {len(self.summary)} configurations")
         return True
     
+    def _frame(self) -> pd.DataFrame:
+        """تبدیل نتایج به DataFrame (یک‌بار برای هر بارگذاری)"""
+        
+        if 'frame' not in self._cache:
+            df = pd.DataFrame(self.results)
+            if 'category' not in df:
+                df['category'] = 'unknown'
+            if 'total_tokens' not in df:
+                df['total_tokens'] = 0
+            df['category'] = df['category'].fillna('unknown')
+            df['total_tokens'] = df['total_tokens'].fillna(0)
+            self._cache['frame'] = df
+        
+        return self._cache['frame']
+    
+    def _group_stats(self, by: List[str], with_range: bool = True) -> Dict[tuple, Dict[str, Any]]:
+        """محاسبه آمار گروه‌ها با groupby"""
+        
+        if not self.results:
+            return {}
+        
+        df = self._frame()
+        counts = df.groupby(by, sort=False)['success'].agg(total='size', success='sum')
+        successful = df[df['success'].astype(bool)]
+        timing = successful.groupby(by, sort=False).agg(
+            sum_t=('time_ms', 'sum'),
+            min_t=('time_ms', 'min'),
+            max_t=('time_ms', 'max'),
+            sum_k=('total_tokens', 'sum')
+        )
+        if with_range:
+            # صدک‌ها با درون‌یابی خطی (همان روش numpy.percentile)
+            percentiles = successful.groupby(by, sort=False)['time_ms'] \
+                .quantile([0.5, 0.95, 0.99]).unstack()
+            timing = timing.join(percentiles.rename(columns={0.5: 'p50_t', 0.95: 'p95_t', 0.99: 'p99_t'}))
+        # TTFT فقط در اجراهای --stream ثبت می‌شود
+        with_ttft = with_range and 'ttft_ms' in df and df['ttft_ms'].notna().any()
+        if with_ttft:
+            ttft = successful.groupby(by, sort=False)['ttft_ms'].quantile([0.5, 0.95]).unstack()
+            timing = timing.join(ttft.rename(columns={0.5: 'p50_f', 0.95: 'p95_f'}))
+        grouped = counts.join(timing).fillna(0)
+        
+        group_stats = {}
+        
+        for key, row in zip(grouped.index, grouped.itertuples(index=False)):
+            total = int(row.total)
+            success = int(row.success)
+            stats = {
+                'total': total,
+                'success': success,
+                'failed': total - success
+            }
+            
+            if success:
+                stats['avg_time_ms'] = int(row.sum_t) // success
+                if with_range:
+                    stats['p50_time_ms'] = int(row.p50_t)
+                    stats['p95_time_ms'] = int(row.p95_t)
+                    stats['p99_time_ms'] = int(row.p99_t)
+                    stats['min_time_ms'] = int(row.min_t)
+                    stats['max_time_ms'] = int(row.max_t)
+                if with_ttft:
+                    stats['p50_ttft_ms'] = int(row.p50_f)
+                    stats['p95_ttft_ms'] = int(row.p95_f)
+                stats['avg_tokens'] = int(row.sum_k) // success
+                stats['success_rate'] = success / total
+            else:
+                stats['avg_time_ms'] = 0
+                if with_range:
+                    stats['p50_time_ms'] = stats['p95_time_ms'] = stats['p99_time_ms'] = 0
+                    stats['min_time_ms'] = 0
+                    stats['max_time_ms'] = 0
+                if with_ttft:
+                    stats['p50_ttft_ms'] = stats['p95_ttft_ms'] = 0
+                stats['avg_tokens'] = 0
+                stats['success_rate'] = 0.0
+            
+            group_stats[key if isinstance(key, tuple) else (key,)] = stats
+        
+        return group_stats
+    
     def analyze_by_provider(self) -> Dict[str, Any]:
         """تحلیل بر اساس provider"""
         
-        provider_stats = {}
+        if 'provider' in self._cache:
+            return self._cache['provider']
         
-        for result in self.results:
-            provider = result['provider']
-            
-            if provider not in provider_stats:
-                provider_stats[provider] = {
-                    'total': 0,
-                    'success': 0,
-                    'failed': 0,
-                    'times': [],
-                    'tokens': []
-                }
-            
-            provider_stats[provider]['total'] += 1
-            
-            if result['success']:
-                provider_stats[provider]['success'] += 1
-                provider_stats[provider]['times'].append(result['time_ms'])
-                provider_stats[provider]['tokens'].append(result.get('total_tokens', 0))
-            else:
-                provider_stats[provider]['failed'] += 1
-        
-        for provider, stats in provider_stats.items():
-            if stats['times']:
-                stats['avg_time_ms'] = int(sum(stats['times']) / len(stats['times']))
-                stats['min_time_ms'] = min(stats['times'])
-                stats['max_time_ms'] = max(stats['times'])
-                stats['avg_tokens'] = int(sum(stats['tokens']) / len(stats['tokens']))
-                stats['success_rate'] = stats['success'] / stats['total']
-            
-            del stats['times']
-            del stats['tokens']
+        provider_stats = {
+            provider: stats
+            for (provider,), stats in self._group_stats(['provider']).items()
+        }
         
+        self._cache['provider'] = provider_stats
         return provider_stats
     
     def analyze_by_model(self) -> Dict[str, Any]:
         """تحلیل بر اساس model"""
         
-        model_stats = {}
+        if 'model' in self._cache:
+            return self._cache['model']
         
-        for result in self.results:
-            key = f"{result['provider']}/{result['model']}"
-            
-            if key not in model_stats:
-                model_stats[key] = {
-                    'provider': result['provider'],
-                    'model': result['model'],
-                    'total': 0,
-                    'success': 0,
-                    'failed': 0,
-                    'times': [],
-                    'tokens': []
-                }
-            
-            model_stats[key]['total'] += 1
-            
-            if result['success']:
-                model_stats[key]['success'] += 1
-                model_stats[key]['times'].append(result['time_ms'])
-                model_stats[key]['tokens'].append(result.get('total_tokens', 0))
-            else:
-                model_stats[key]['failed'] += 1
-        
-        for key, stats in model_stats.items():
-            if stats['times']:
-                stats['avg_time_ms'] = int(sum(stats['times']) / len(stats['times']))
-                stats['min_time_ms'] = min(stats['times'])
-                stats['max_time_ms'] = max(stats['times'])
-                stats['avg_tokens'] = int(sum(stats['tokens']) / len(stats['tokens']))
-                stats['success_rate'] = stats['success'] / stats['total']
-            
-            del stats['times']
-            del stats['tokens']
+        model_stats = {
+            f"{provider}/{model}": {'provider': provider, 'model': model, **stats}
+            for (provider, model), stats in self._group_stats(['provider', 'model']).items()
+        }
         
+        self._cache['model'] = model_stats
         return model_stats
     
     def analyze_by_category(self) -> Dict[str, Any]:
         """تحلیل بر اساس دسته‌بندی سوالات"""
         
-        category_stats = {}
-        
-        for result in self.results:
-            category = result.get('category', 'unknown')
-            
-            if category not in category_stats:
-                category_stats[category] = {
-                    'total': 0,
-                    'success': 0,
-                    'failed': 0,
-                    'times': [],
-                    'tokens': []
-                }
-            
-            category_stats[category]['total'] += 1
-            
-            if result['success']:
-                category_stats[category]['success'] += 1
-                category_stats[category]['times'].append(result['time_ms'])
-                category_stats[category]['tokens'].append(result.get('total_tokens', 0))
-            else:
-                category_stats[category]['failed'] += 1
+        if 'category' in self._cache:
+            return self._cache['category']
         
-        for category, stats in category_stats.items():
-            if stats['times']:
-                stats['avg_time_ms'] = int(sum(stats['times']) / len(stats['times']))
-                stats['avg_tokens'] = int(sum(stats['tokens']) / len(stats['tokens']))
-                stats['success_rate'] = stats['success'] / stats['total']
-            
-            del stats['times']
-            del stats['tokens']
+        category_stats = {
+            category: stats
+            for (category,), stats in self._group_stats(['category'], with_range=False).items()
+        }
         
+        self._cache['category'] = category_stats
         return category_stats
     
     def generate_markdown_report(self, output_file: str = None):
@@ -204,39 +237,67 @@ class LLMBenchmarkAnalyzer:
         report.append("\n| Provider | تعداد | موفق | ناموفق | میانگین زمان | میانگین توکن | نرخ موفقیت |\n")
         report.append("|----------|-------|------|--------|--------------|--------------|------------|\n")
         
-        for provider, stats in sorted(provider_stats.items()):
-            report.append(
-                f"| {provider} | {stats['total']} | {stats['success']} | {stats['failed']} | "
-                f"{stats.get('avg_time_ms', 0)}ms | {stats.get('avg_tokens', 0)} | "
-                f"{stats.get('success_rate', 0)*100:.1f}% |\n"
+        report.append(_join_rows(
+            PROVIDER_ROW_TMPL.format(
+                key=provider,
+                total=stats['total'],
+                success=stats['success'],
+                failed=stats['failed'],
+                avg=stats.get('avg_time_ms', 0),
+                tokens=stats.get('avg_tokens', 0),
+                rate=stats.get('success_rate', 0) * 100
             )
+            for provider, stats in sorted(provider_stats.items())
+        ))
         
         report.append("\n---\n")
         report.append("\n## 🎯 نتایج تفصیلی بر اساس Model\n")
-        report.append("\n| Provider/Model | تعداد | موفق | میانگین زمان | Min | Max | میانگین توکن | نرخ موفقیت |\n")
-        report.append("|----------------|-------|------|--------------|-----|-----|--------------|------------|\n")
-        
-        sorted_models = sorted(model_stats.items(), key=lambda x: x[1].get('avg_time_ms', 0))
-        
-        for key, stats in sorted_models:
-            report.append(
-                f"| {key} | {stats['total']} | {stats['success']} | "
-                f"{stats.get('avg_time_ms', 0)}ms | {stats.get('min_time_ms', 0)}ms | "
-                f"{stats.get('max_time_ms', 0)}ms | {stats.get('avg_tokens', 0)} | "
-                f"{stats.get('success_rate', 0)*100:.1f}% |\n"
+        with_ttft = any('p50_ttft_ms' in stats for stats in model_stats.values())
+        if with_ttft:
+            report.append("\n| Provider/Model | تعداد | موفق | میانگین زمان | P50 | P95 | P99 | Min | Max | TTFT P50 | TTFT P95 | میانگین توکن | نرخ موفقیت |\n")
+            report.append("|----------------|-------|------|--------------|-----|-----|-----|-----|-----|----------|----------|--------------|------------|\n")
+        else:
+            report.append("\n| Provider/Model | تعداد | موفق | میانگین زمان | P50 | P95 | P99 | Min | Max | میانگین توکن | نرخ موفقیت |\n")
+            report.append("|----------------|-------|------|--------------|-----|-----|-----|-----|-----|--------------|------------|\n")
+        
+        sorted_models = sorted(model_stats.items(), key=lambda x: x[1]['avg_time_ms'])
+        row_tmpl = MODEL_ROW_TTFT_TMPL if with_ttft else MODEL_ROW_TMPL
+        
+        report.append(_join_rows(
+            row_tmpl.format(
+                key=key,
+                total=stats['total'],
+                success=stats['success'],
+                avg=stats.get('avg_time_ms', 0),
+                p50=stats.get('p50_time_ms', 0),
+                p95=stats.get('p95_time_ms', 0),
+                p99=stats.get('p99_time_ms', 0),
+                min=stats.get('min_time_ms', 0),
+                max=stats.get('max_time_ms', 0),
+                ttft50=stats.get('p50_ttft_ms', 0),
+                ttft95=stats.get('p95_ttft_ms', 0),
+                tokens=stats.get('avg_tokens', 0),
+                rate=stats.get('success_rate', 0) * 100
             )
+            for key, stats in sorted_models
+        ))
         
         report.append("\n---\n")
         report.append("\n## 📂 تحلیل بر اساس دسته‌بندی سوالات\n")
         report.append("\n| دسته‌بندی | تعداد | موفق | میانگین زمان | میانگین توکن | نرخ موفقیت |\n")
         report.append("|----------|-------|------|--------------|--------------|------------|\n")
         
-        for category, stats in sorted(category_stats.items()):
-            report.append(
-                f"| {category} | {stats['total']} | {stats['success']} | "
-                f"{stats.get('avg_time_ms', 0)}ms | {stats.get('avg_tokens', 0)} | "
-                f"{stats.get('success_rate', 0)*100:.1f}% |\n"
+        report.append(_join_rows(
+            CATEGORY_ROW_TMPL.format(
+                key=category,
+                total=stats['total'],
+                success=stats['success'],
+                avg=stats.get('avg_time_ms', 0),
+                tokens=stats.get('avg_tokens', 0),
+                rate=stats.get('success_rate', 0) * 100
             )
+            for category, stats in sorted(category_stats.items())
+        ))
         
         report.append("\n---\n")
         report.append("\n## 🏆 توصیه‌ها\n\n")
@@ -246,14 +307,15 @@ class LLMBenchmarkAnalyzer:
             report.append(f"### سریع‌ترین مدل\n")
             report.append(f"- **{fastest[0]}**: {fastest[1].get('avg_time_ms', 0)}ms میانگین زمان\n\n")
         
-        most_efficient = sorted(
-            [(k, v) for k, v in model_stats.items() if v.get('success_rate', 0) == 1.0],
-            key=lambda x: x[1].get('avg_tokens', 0)
+        most_efficient = min(
+            ((k, v) for k, v in model_stats.items() if v['success_rate'] == 1.0),
+            key=lambda x: x[1]['avg_tokens'],
+            default=None
         )
         
         if most_efficient:
             report.append(f"### کارآمدترین مدل (کمترین توکن با 100% موفقیت)\n")
-            report.append(f"- **{most_efficient[0][0]}**: {most_efficient[0][1].get('avg_tokens', 0)} توکن میانگین\n\n")
+            report.append(f"- **{most_efficient[0]}**: {most_efficient[1]['avg_tokens']} توکن میانگین\n\n")
         
         report.append("\n---\n")
         report.append("\n## 📝 نمونه پاسخ‌ها\n\n")
@@ -267,10 +329,7 @@ class LLMBenchmarkAnalyzer:
                 report.append(f"**زمان:** {result['time_ms']}ms | **توکن:** {result.get('total_tokens', 0)}\n\n")
                 report.append("---\n\n")
         
-        report_content = "".join(report)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        Path(output_file).write_text("".join(report), encoding='utf-8')
         
         print(f"\n✅ Report generated: {output_file}")
         
@@ -287,22 +346,31 @@ class LLMBenchmarkAnalyzer:
         print(f"📊 SUMMARY TABLE")
         print(f"{'='*100}\n")
         
-        print(f"{'Provider/Model':<35} {'Tests':<8} {'Success':<10} {'Avg Time':<12} {'Tokens':<10} {'Rate':<8}")
+        with_ttft = any('p50_ttft_ms' in data for data in self.summary.values())
+        ttft_header = f" {'TTFT P50':<10} {'TTFT P95':<10}" if with_ttft else ""
+        
+        print(f"{'Provider/Model':<35} {'Tests':<8} {'Success':<10} {'Avg Time':<12} {'P95':<10} {'P99':<10}{ttft_header} {'Tokens':<10} {'Rate':<8}")
         print(f"{'-'*100}")
         
         sorted_summary = sorted(
             self.summary.items(),
-            key=lambda x: x[1].get('avg_time_ms', 0)
+            key=lambda x: x[1]['avg_time_ms']
         )
         
         for key, data in sorted_summary:
             tests_str = f"{data['total_queries']}"
             success_str = f"{data['successful']}/{data['total_queries']}"
             time_str = f"{data.get('avg_time_ms', 0)}ms"
+            p95_str = f"{data.get('p95_time_ms', 0)}ms"
+            p99_str = f"{data.get('p99_time_ms', 0)}ms"
             tokens_str = f"{data.get('avg_tokens', 0)}"
             rate_str = f"{data.get('success_rate', 0)*100:.1f}%"
+            ttft_str = (
+                f" {str(data.get('p50_ttft_ms', 0)) + 'ms':<10} {str(data.get('p95_ttft_ms', 0)) + 'ms':<10}"
+                if with_ttft else ""
+            )
             
-            print(f"{key:<35} {tests_str:<8} {success_str:<10} {time_str:<12} {tokens_str:<10} {rate_str:<8}")
+            print(f"{key:<35} {tests_str:<8} {success_str:<10} {time_str:<12} {p95_str:<10} {p99_str:<10}{ttft_str} {tokens_str:<10} {rate_str:<8}")
         
         print(f"\n{'='*100}\n")
 
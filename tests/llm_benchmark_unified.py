@@ -6,19 +6,32 @@
 """
 
 import asyncio
-import json
 import os
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import argparse
 
+import numpy as np
+import orjson
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from tenacity import (
+    AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential, wait_random
+)
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 sys.path.append(str(Path(__file__).parent.parent))
 
-from app.llm.factory import LLMWithFallback
-from app.llm.models import LLMConfig, Message
+from app.config.settings import settings
+from app.llm.base import LLMConfig, Message
+from app.llm.openai_provider import OpenAIProvider
 from llm_test_config import (
     PROVIDERS, LLM_TYPES, TEST_QUERIES, TEST_CONFIGS,
     get_provider_config, get_llm_type_config, get_test_config,
@@ -26,15 +39,108 @@ from llm_test_config import (
 )
 
 
+# خطاهای گذرا (rate limit، timeout، خطای سرور) با backoff تکرار می‌شوند
+TRANSIENT_ERRORS = (
+    RateLimitError, APITimeoutError, APIConnectionError, InternalServerError, asyncio.TimeoutError
+)
+MAX_ATTEMPTS = 4
+
+
+def _fast_iso(ts: float) -> str:
+    """تبدیل سریع timestamp به رشته ISO (UTC) بدون datetime"""
+    y, mo, d, h, mi, sec = time.gmtime(ts)[:6]
+    return f"{y:04d}-{mo:02d}-{d:02d}T{h:02d}:{mi:02d}:{sec:02d}Z"
+
+
+def _reduce_groups_loop(group_ids, times, tokens, n_groups):
+    """کاهش آماری هر گروه در یک گذر (برای کامپایل با Numba)"""
+    counts = np.zeros(n_groups, dtype=np.int64)
+    sums = np.zeros(n_groups, dtype=np.int64)
+    mins = np.full(n_groups, np.iinfo(np.int64).max, dtype=np.int64)
+    maxs = np.zeros(n_groups, dtype=np.int64)
+    token_sums = np.zeros(n_groups, dtype=np.int64)
+    
+    for i in range(group_ids.shape[0]):
+        g = group_ids[i]
+        t = times[i]
+        counts[g] += 1
+        sums[g] += t
+        if t < mins[g]:
+            mins[g] = t
+        if t > maxs[g]:
+            maxs[g] = t
+        token_sums[g] += tokens[i]
+    
+    return counts, sums, mins, maxs, token_sums
+
+
+def _reduce_groups_numpy(group_ids, times, tokens, n_groups):
+    """کاهش آماری هر گروه با عملیات برداری NumPy (بدون Numba)"""
+    counts = np.bincount(group_ids, minlength=n_groups).astype(np.int64)
+    sums = np.zeros(n_groups, dtype=np.int64)
+    np.add.at(sums, group_ids, times)
+    mins = np.full(n_groups, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(mins, group_ids, times)
+    maxs = np.zeros(n_groups, dtype=np.int64)
+    np.maximum.at(maxs, group_ids, times)
+    token_sums = np.zeros(n_groups, dtype=np.int64)
+    np.add.at(token_sums, group_ids, tokens)
+    return counts, sums, mins, maxs, token_sums
+
+
+def _group_percentiles(group_ids, times, n_groups, q=(50, 95, 99)):
+    """صدک‌های زمان پاسخ هر گروه (p50/p95/p99)"""
+    order = np.argsort(group_ids, kind='stable')
+    bounds = np.cumsum(np.bincount(group_ids, minlength=n_groups))[:-1]
+    return [
+        np.percentile(chunk, q) if chunk.size else np.zeros(len(q))
+        for chunk in np.split(times[order], bounds)
+    ]
+
+
+if HAS_NUMBA:
+    _reduce_groups = njit(cache=True, boundscheck=False)(_reduce_groups_loop)
+else:
+    _reduce_groups = _reduce_groups_numpy
+
+
 class LLMBenchmarkUnified:
     """کلاس اصلی برای تست جامع LLM ها"""
     
-    def __init__(self, output_dir: str = "benchmark_results"):
+    def __init__(
+        self,
+        output_dir: str = "benchmark_results",
+        quiet: bool = False,
+        stream: bool = False
+    ):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.quiet = quiet
+        self.stream = stream
+        self._run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.results = []
         self.summary = {}
-        
+        self._prepared: Dict[tuple, Tuple[LLMConfig, OpenAIProvider]] = {}
+        # محدودیت هم‌زمانی جداگانه برای هر provider
+        self._limiters = {
+            key: asyncio.Semaphore(cfg.get('max_concurrency', 2))
+            for key, cfg in PROVIDERS.items()
+        }
+        
+    async def aclose(self):
+        """بستن اتصال‌های HTTP کلاینت‌های نگه‌داری‌شده"""
+        for _, llm in self._prepared.values():
+            await llm.client.close()
+            llm.sync_client.close()
+        self._prepared.clear()
+    
+    def _flush_log(self, lines: List[str]):
+        """چاپ یک‌جای خطوط لاگ (در حالت quiet چیزی چاپ نمی‌شود)"""
+        if self.quiet or not lines:
+            return
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
     def _get_api_key(self, env_var: str) -> str:
         """دریافت API key از environment"""
         api_key = os.getenv(env_var, "")
@@ -42,26 +148,23 @@ class LLMBenchmarkUnified:
             print(f"⚠️  Warning: {env_var} not found in environment")
         return api_key
     
-    async def test_single_query(
+    def _prepare(
         self,
         provider_key: str,
         model: str,
-        query: str,
-        llm_type: str = "llm2",
-        query_id: str = None,
-        category: str = None
-    ) -> Dict[str, Any]:
-        """تست یک سوال با یک مدل خاص"""
+        llm_type: str
+    ) -> Optional[Tuple[LLMConfig, OpenAIProvider]]:
+        """ساخت (یک‌باره) LLMConfig و کلاینت برای یک ترکیب provider/model/llm_type"""
+        
+        key = (provider_key, model, llm_type)
+        if key in self._prepared:
+            return self._prepared[key]
         
         provider_config = get_provider_config(provider_key)
         llm_config_data = get_llm_type_config(llm_type)
         
         if not provider_config or not llm_config_data:
-            return {
-                'error': 'Invalid provider or llm_type',
-                'provider': provider_key,
-                'model': model
-            }
+            return None
         
         api_key = self._get_api_key(provider_config['api_key_env'])
         
@@ -74,15 +177,82 @@ class LLMBenchmarkUnified:
             temperature=llm_config_data['temperature']
         )
         
-        llm = LLMWithFallback(primary_config=llm_config, fallback_config=None)
+        # کلاینت بین سوالات مشترک است تا اتصال keep-alive حفظ شود
+        llm = OpenAIProvider(llm_config)
+        # retry فقط با tenacity (تعداد تلاش و زمان‌سنجی دقیق)، نه retry داخلی SDK
+        llm.client = llm.client.with_options(max_retries=0, timeout=settings.llm_primary_timeout)
+        llm.sync_client = llm.sync_client.with_options(max_retries=0, timeout=settings.llm_primary_timeout)
+        
+        self._prepared[key] = (llm_config, llm)
+        return self._prepared[key]
+    
+    async def test_single_query(
+        self,
+        provider_key: str,
+        model: str,
+        query: str,
+        llm_type: str = "llm2",
+        query_id: str = None,
+        category: str = None
+    ) -> Dict[str, Any]:
+        """تست یک سوال با یک مدل خاص"""
+        
+        prepared = self._prepare(provider_key, model, llm_type)
+        
+        if prepared is None:
+            return {
+                'error': 'Invalid provider or llm_type',
+                'provider': provider_key,
+                'model': model
+            }
+        
+        _, llm = prepared
+        
+        # رشته‌های تکراری بین همه نتایج یک شیء مشترک دارند
+        provider_key = sys.intern(provider_key)
+        model = sys.intern(model)
+        llm_type = sys.intern(llm_type)
+        category = sys.intern(category or 'unknown')
         
         messages = [Message(role="user", content=query)]
         
-        start_time = time.time()
+        first_token_ns = None
+        start_ns = None
+        attempts = 0
+        
+        def mark_first_token(_delta: str):
+            nonlocal first_token_ns
+            if first_token_ns is None:
+                first_token_ns = time.perf_counter_ns()
+        
+        retrying = AsyncRetrying(
+            retry=retry_if_exception_type(TRANSIENT_ERRORS),
+            wait=wait_exponential(multiplier=1, min=1, max=30) + wait_random(0, 2),
+            stop=stop_after_attempt(MAX_ATTEMPTS),
+            reraise=True
+        )
         
         try:
-            response = await llm.generate(messages)
-            end_time = time.time()
+            # مستقیم با provider (همان Responses API که LLMWithFallback.generate صدا می‌زند)
+            # تا خطای typed برای retry در دسترس باشد و وضعیت سراسری «primary down»
+            # با یک خطای گذرا بقیه سوالات را خراب نکند
+            async for attempt in retrying:
+                with attempt:
+                    attempts += 1
+                    # جای provider فقط در طول درخواست گرفته می‌شود و در backoff آزاد است
+                    async with self._limiters[provider_key]:
+                        first_token_ns = None
+                        # زمان‌سنجی فقط تلاش آخر (بدون انتظار صف و backoff)
+                        start_ns = time.perf_counter_ns()
+                        if self.stream:
+                            call = llm.generate_responses_api_stream(
+                                messages, on_delta=mark_first_token, reasoning_effort="medium"
+                            )
+                        else:
+                            call = llm.generate_responses_api(messages, reasoning_effort="medium")
+                        # همان سقف زمانی LLMWithFallback.generate برای هر تلاش
+                        response = await asyncio.wait_for(call, timeout=settings.llm_primary_timeout)
+                        end_ns = time.perf_counter_ns()
             
             result = {
                 'query_id': query_id,
@@ -93,15 +263,20 @@ class LLMBenchmarkUnified:
                 'query': query,
                 'answer': response.content,
                 'success': True,
-                'time_ms': int((end_time - start_time) * 1000),
+                'time_ms': (end_ns - start_ns) // 1_000_000,
                 'input_tokens': response.usage.get('prompt_tokens', 0),
                 'output_tokens': response.usage.get('completion_tokens', 0),
                 'total_tokens': response.usage.get('total_tokens', 0),
-                'timestamp': datetime.now().isoformat()
+                'attempts': attempts,
+                'timestamp': _fast_iso(time.time())
             }
             
+            if self.stream:
+                # زمان تا اولین توکن (TTFT)؛ پاسخ خالی = کل زمان
+                result['ttft_ms'] = ((first_token_ns or end_ns) - start_ns) // 1_000_000
+            
         except Exception as e:
-            end_time = time.time()
+            end_ns = time.perf_counter_ns()
             result = {
                 'query_id': query_id,
                 'category': category,
@@ -111,9 +286,10 @@ class LLMBenchmarkUnified:
                 'query': query,
                 'answer': None,
                 'success': False,
-                'error': str(e),
-                'time_ms': int((end_time - start_time) * 1000),
-                'timestamp': datetime.now().isoformat()
+                'error': str(e) or type(e).__name__,
+                'time_ms': (end_ns - (start_ns or end_ns)) // 1_000_000,
+                'attempts': attempts,
+                'timestamp': _fast_iso(time.time())
             }
         
         return result
@@ -127,9 +303,12 @@ class LLMBenchmarkUnified:
     ) -> List[Dict]:
         """تست یک ترکیب provider + model با لیست سوالات"""
         
-        print(f"\n{'='*80}")
-        print(f"🧪 Testing: {provider_key}/{model} ({llm_type})")
-        print(f"{'='*80}")
+        # خطوط لاگ هر ترکیب جمع‌آوری و یک‌جا چاپ می‌شوند
+        log = [
+            f"\n{'='*80}",
+            f"🧪 Testing: {provider_key}/{model} ({llm_type})",
+            f"{'='*80}"
+        ]
         
         results = []
         
@@ -138,7 +317,7 @@ class LLMBenchmarkUnified:
             query_id = query_data.get('id', f'q_{i}')
             category = query_data.get('category', 'unknown')
             
-            print(f"\n[{i}/{len(queries)}] Query: {query[:60]}...")
+            log.append(f"\n[{i}/{len(queries)}] Query: {query[:60]}...")
             
             result = await self.test_single_query(
                 provider_key=provider_key,
@@ -152,11 +331,12 @@ class LLMBenchmarkUnified:
             results.append(result)
             
             if result['success']:
-                print(f"  ✅ Success | Time: {result['time_ms']}ms | Tokens: {result['total_tokens']}")
+                ttft = f" | TTFT: {result['ttft_ms']}ms" if 'ttft_ms' in result else ""
+                log.append(f"  ✅ Success | Time: {result['time_ms']}ms{ttft} | Tokens: {result['total_tokens']}")
             else:
-                print(f"  ❌ Failed | Error: {result.get('error', 'Unknown')}")
-            
-            await asyncio.sleep(0.5)
+                log.append(f"  ❌ Failed | Error: {result.get('error', 'Unknown')}")
+        
+        self._flush_log(log)
         
         return results
     
@@ -170,6 +350,7 @@ class LLMBenchmarkUnified:
         """اجرای یک تست با تنظیمات مشخص"""
         
         config = get_test_config(config_name)
+        self._run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         print(f"\n{'#'*80}")
         print(f"# 🚀 Starting Benchmark: {config['name']}")
@@ -177,9 +358,12 @@ class LLMBenchmarkUnified:
         print(f"# LLM Type: {llm_type}")
         print(f"{'#'*80}\n")
         
-        test_providers = providers or config.get('providers', ['gapgpt'])
+        # تکرار provider/model در ورودی یعنی پرداخت دوباره برای همان پاسخ‌ها
+        test_providers = list(dict.fromkeys(providers or config.get('providers', ['gapgpt'])))
+        if models:
+            models = list(dict.fromkeys(models))
         
-        all_results = []
+        test_plan = []
         
         for provider_key in test_providers:
             provider_config = get_provider_config(provider_key)
@@ -193,21 +377,47 @@ class LLMBenchmarkUnified:
                 test_models = [m for m in models if m in available_models]
             else:
                 models_limit = config.get('models_per_provider')
-                test_models = available_models[:models_limit] if models_limit else available_models
+                test_models = list(dict.fromkeys(available_models))
+                test_models = test_models[:models_limit] if models_limit else test_models
             
+            test_plan.append((provider_key, test_models))
+        
+        # تعداد کل تست‌ها از قبل مشخص است؛ لیست نتایج یک‌بار تخصیص داده می‌شود
+        queries_per_model = sum(len(q) for q in config['queries'].values() if q)
+        expected = queries_per_model * sum(len(m) for _, m in test_plan)
+        all_results = [None] * expected
+        idx = 0
+        
+        for provider_key, test_models in test_plan:
             for model in test_models:
-                for query_category, queries in config['queries'].items():
-                    if not queries:
-                        continue
-                    
-                    results = await self.test_provider_model_combination(
-                        provider_key=provider_key,
-                        model=model,
-                        queries=queries,
-                        llm_type=llm_type
-                    )
-                    
-                    all_results.extend(results)
+                self._prepare(provider_key, model, llm_type)
+        
+        async def run_pair(provider_key: str, model: str) -> List[Dict]:
+            pair_results = []
+            for query_category, queries in config['queries'].items():
+                if not queries:
+                    continue
+                
+                pair_results.extend(await self.test_provider_model_combination(
+                    provider_key=provider_key,
+                    model=model,
+                    queries=queries,
+                    llm_type=llm_type
+                ))
+            return pair_results
+        
+        # ترکیب‌ها هم‌زمان اجرا می‌شوند؛ هر provider با semaphore خودش محدود می‌شود
+        pair_results = await asyncio.gather(*[
+            run_pair(provider_key, model)
+            for provider_key, test_models in test_plan
+            for model in test_models
+        ])
+        
+        for results in pair_results:
+            all_results[idx:idx + len(results)] = results
+            idx += len(results)
+        
+        all_results = all_results[:idx]
         
         self.results = all_results
         self._generate_summary()
@@ -219,6 +429,11 @@ class LLMBenchmarkUnified:
         """تولید خلاصه نتایج"""
         
         summary = {}
+        group_index = {}
+        group_ids = []
+        times = []
+        tokens = []
+        ttfts = []
         
         for result in self.results:
             provider = result['provider']
@@ -226,6 +441,7 @@ class LLMBenchmarkUnified:
             key = f"{provider}/{model}"
             
             if key not in summary:
+                group_index[key] = len(group_index)
                 summary[key] = {
                     'provider': provider,
                     'model': model,
@@ -233,65 +449,88 @@ class LLMBenchmarkUnified:
                     'successful': 0,
                     'failed': 0,
                     'total_time_ms': 0,
-                    'total_tokens': 0,
-                    'times': [],
-                    'tokens': []
+                    'total_tokens': 0
                 }
             
             summary[key]['total_queries'] += 1
             
             if result['success']:
                 summary[key]['successful'] += 1
-                summary[key]['total_time_ms'] += result['time_ms']
-                summary[key]['total_tokens'] += result.get('total_tokens', 0)
-                summary[key]['times'].append(result['time_ms'])
-                summary[key]['tokens'].append(result.get('total_tokens', 0))
+                group_ids.append(group_index[key])
+                times.append(result['time_ms'])
+                tokens.append(result.get('total_tokens', 0))
+                ttfts.append(result.get('ttft_ms', result['time_ms']))
             else:
                 summary[key]['failed'] += 1
         
+        group_ids = np.asarray(group_ids, dtype=np.int64)
+        times = np.asarray(times, dtype=np.int64)
+        counts, sums, mins, maxs, token_sums = _reduce_groups(
+            group_ids,
+            times,
+            np.asarray(tokens, dtype=np.int64),
+            len(group_index)
+        )
+        percentiles = _group_percentiles(group_ids, times, len(group_index))
+        if self.stream:
+            ttft_percentiles = _group_percentiles(
+                group_ids, np.asarray(ttfts, dtype=np.int64), len(group_index), q=(50, 95)
+            )
+        
         for key, data in summary.items():
+            g = group_index[key]
             if data['successful'] > 0:
-                data['avg_time_ms'] = int(data['total_time_ms'] / data['successful'])
-                data['avg_tokens'] = int(data['total_tokens'] / data['successful'])
-                data['min_time_ms'] = min(data['times'])
-                data['max_time_ms'] = max(data['times'])
+                data['total_time_ms'] = int(sums[g])
+                data['total_tokens'] = int(token_sums[g])
+                data['avg_time_ms'] = int(sums[g] / counts[g])
+                data['avg_tokens'] = int(token_sums[g] / counts[g])
+                data['min_time_ms'] = int(mins[g])
+                data['max_time_ms'] = int(maxs[g])
+                data['p50_time_ms'], data['p95_time_ms'], data['p99_time_ms'] = (
+                    int(p) for p in percentiles[g]
+                )
+                if self.stream:
+                    data['p50_ttft_ms'], data['p95_ttft_ms'] = (
+                        int(p) for p in ttft_percentiles[g]
+                    )
                 data['success_rate'] = data['successful'] / data['total_queries']
             else:
                 data['avg_time_ms'] = 0
                 data['avg_tokens'] = 0
                 data['min_time_ms'] = 0
                 data['max_time_ms'] = 0
+                data['p50_time_ms'] = data['p95_time_ms'] = data['p99_time_ms'] = 0
+                if self.stream:
+                    data['p50_ttft_ms'] = data['p95_ttft_ms'] = 0
                 data['success_rate'] = 0.0
-            
-            del data['times']
-            del data['tokens']
         
         self.summary = summary
     
     def _save_results(self, config_name: str, llm_type: str):
         """ذخیره نتایج در فایل"""
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._run_timestamp
         
-        results_file = self.output_dir / f"results_{config_name}_{llm_type}_{timestamp}.json"
+        results_file = self.output_dir / f"results_{config_name}_{llm_type}_{timestamp}.jsonl"
         summary_file = self.output_dir / f"summary_{config_name}_{llm_type}_{timestamp}.json"
         
-        with open(results_file, 'w', encoding='utf-8') as f:
-            json.dump({
+        # NDJSON: خط اول مشخصات اجرا و سپس هر نتیجه در یک خط
+        with open(results_file, 'wb') as f:
+            f.write(orjson.dumps({
                 'config': config_name,
                 'llm_type': llm_type,
                 'timestamp': timestamp,
-                'total_tests': len(self.results),
-                'results': self.results
-            }, f, ensure_ascii=False, indent=2)
-        
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'config': config_name,
-                'llm_type': llm_type,
-                'timestamp': timestamp,
-                'summary': self.summary
-            }, f, ensure_ascii=False, indent=2)
+                'total_tests': len(self.results)
+            }) + b'\n')
+            for result in self.results:
+                f.write(orjson.dumps(result) + b'\n')
+        
+        summary_file.write_bytes(orjson.dumps({
+            'config': config_name,
+            'llm_type': llm_type,
+            'timestamp': timestamp,
+            'summary': self.summary
+        }, option=orjson.OPT_INDENT_2))
         
         print(f"\n{'='*80}")
         print(f"💾 Results saved:")
@@ -311,18 +550,26 @@ class LLMBenchmarkUnified:
             key=lambda x: x[1]['avg_time_ms']
         )
         
-        print(f"{'Provider/Model':<30} {'Success':<10} {'Avg Time':<12} {'Avg Tokens':<12} {'Rate':<8}")
-        print(f"{'-'*80}")
+        ttft_header = f" {'TTFT P50':<10} {'TTFT P95':<10}" if self.stream else ""
+        
+        print(f"{'Provider/Model':<30} {'Success':<10} {'Avg Time':<12} {'P95':<10} {'P99':<10}{ttft_header} {'Avg Tokens':<12} {'Rate':<8}")
+        print(f"{'-'*96}")
         
         for key, data in sorted_summary:
             success_str = f"{data['successful']}/{data['total_queries']}"
             time_str = f"{data['avg_time_ms']}ms"
+            p95_str = f"{data.get('p95_time_ms', 0)}ms"
+            p99_str = f"{data.get('p99_time_ms', 0)}ms"
             tokens_str = f"{data['avg_tokens']}"
             rate_str = f"{data['success_rate']*100:.1f}%"
+            ttft_str = (
+                f" {str(data.get('p50_ttft_ms', 0)) + 'ms':<10} {str(data.get('p95_ttft_ms', 0)) + 'ms':<10}"
+                if self.stream else ""
+            )
             
-            print(f"{key:<30} {success_str:<10} {time_str:<12} {tokens_str:<12} {rate_str:<8}")
+            print(f"{key:<30} {success_str:<10} {time_str:<12} {p95_str:<10} {p99_str:<10}{ttft_str} {tokens_str:<12} {rate_str:<8}")
         
-        print(f"\n{'='*80}\n")
+        print(f"\n{'='*96}\n")
 
 
 async def main():
@@ -365,6 +612,18 @@ async def main():
         help='Output directory for results'
     )
     
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Do not print per-query progress lines'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream responses and record time-to-first-token (ttft_ms)'
+    )
+    
     parser.add_argument(
         '--list-models',
         action='store_true',
@@ -388,15 +647,22 @@ async def main():
             print()
         return
     
-    benchmark = LLMBenchmarkUnified(output_dir=args.output_dir)
-    
-    await benchmark.run_test_config(
-        config_name=args.config,
-        providers=args.providers,
-        models=args.models,
-        llm_type=args.llm_type
+    benchmark = LLMBenchmarkUnified(
+        output_dir=args.output_dir,
+        quiet=args.quiet,
+        stream=args.stream
     )
     
+    try:
+        await benchmark.run_test_config(
+            config_name=args.config,
+            providers=args.providers,
+            models=args.models,
+            llm_type=args.llm_type
+        )
+    finally:
+        await benchmark.aclose()
+    
     benchmark.print_summary()
 
 
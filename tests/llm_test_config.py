@@ -4,6 +4,10 @@
 شامل تعریف providers، models، و سوالات تست
 """
 
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
 # =============================================================================
 # LLM Providers Configuration
 # =============================================================================
@@ -13,6 +17,7 @@ PROVIDERS = {
         'name': 'GapGPT',
         'base_url': 'https://api.gapgpt.app/v1',
         'api_key_env': 'LLM1_API_KEY',  # از .env خوانده می‌شود
+        'max_concurrency': 2,  # حداکثر درخواست هم‌زمان به این provider
         'models': [
             'gpt-4o-mini',
             'gpt-5-mini',
@@ -24,6 +29,7 @@ PROVIDERS = {
         'name': 'OpenAI',
         'base_url': 'https://api.openai.com/v1',
         'api_key_env': 'LLM1_FALLBACK_API_KEY',
+        'max_concurrency': 2,
         'models': [
             'gpt-4o-mini',
             'gpt-4o',
@@ -183,6 +189,12 @@ TEST_QUERIES = {
     ]
 }
 
+# متن سوالات یکتا می‌شود تا سوالات تکراری در دسته‌ها و تنظیمات مختلف یک شیء مشترک داشته باشند
+for _queries in TEST_QUERIES.values():
+    for _query in _queries:
+        _query['query'] = sys.intern(_query['query'])
+del _queries, _query
+
 # =============================================================================
 # Test Configurations
 # =============================================================================
@@ -302,6 +314,31 @@ BENCHMARK_HISTORY = {
     }
 }
 
+# =============================================================================
+# Freeze (تنظیمات فقط‌خواندنی و قابل اشتراک بدون کپی)
+# =============================================================================
+
+def _freeze(obj, memo: dict):
+    """تبدیل بازگشتی dict/list به MappingProxyType/tuple (اشیای مشترک، مشترک می‌مانند)"""
+    if id(obj) in memo:
+        return memo[id(obj)]
+    if isinstance(obj, dict):
+        frozen = MappingProxyType({k: _freeze(v, memo) for k, v in obj.items()})
+    elif isinstance(obj, list):
+        frozen = tuple(_freeze(item, memo) for item in obj)
+    else:
+        return obj
+    memo[id(obj)] = frozen
+    return frozen
+
+_memo = {}
+PROVIDERS = _freeze(PROVIDERS, _memo)
+LLM_TYPES = _freeze(LLM_TYPES, _memo)
+TEST_QUERIES = _freeze(TEST_QUERIES, _memo)
+TEST_CONFIGS = _freeze(TEST_CONFIGS, _memo)
+BENCHMARK_HISTORY = _freeze(BENCHMARK_HISTORY, _memo)
+del _memo
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
@@ -318,20 +355,23 @@ def get_test_config(config_name: str) -> dict:
     """دریافت تنظیمات یک نوع تست"""
     return TEST_CONFIGS.get(config_name, TEST_CONFIGS['standard'])
 
-def get_queries_for_test(test_type: str, category: str = None) -> list:
+# جدول مسیریابی سوالات: یک lookup به جای fallback زنجیره‌ای
+_QUERY_ROUTE = {category: tuple(queries) for category, queries in TEST_QUERIES.items()}
+
+def get_queries_for_test(test_type: str, category: str = None) -> tuple:
     """دریافت سوالات برای یک نوع تست"""
-    if category:
-        return TEST_QUERIES.get(category, [])
-    return TEST_QUERIES.get(test_type, [])
+    return _QUERY_ROUTE.get(category or test_type, ())
 
-def list_available_models(provider_key: str = None) -> dict:
-    """لیست مدل‌های موجود"""
+@lru_cache(maxsize=None)
+def list_available_models(provider_key: str = None) -> MappingProxyType:
+    """لیست مدل‌های موجود (فقط‌خواندنی، یک‌بار ساخته می‌شود)"""
     if provider_key:
         provider = PROVIDERS.get(provider_key, {})
-        return {provider_key: provider.get('models', [])}
+        return MappingProxyType({provider_key: provider.get('models', ())})
     
-    return {k: v.get('models', []) for k, v in PROVIDERS.items()}
+    return MappingProxyType({k: v.get('models', ()) for k, v in PROVIDERS.items()})
 
+@lru_cache(maxsize=None)
 def get_recommended_model(llm_type: str, provider_key: str) -> str:
     """دریافت مدل پیشنهادی برای یک نوع LLM و provider"""
     llm_config = LLM_TYPES.get(llm_type, {})
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+بررسی Semantic Cache روی /api/v1/query
+یک سوال و سپس عبارت‌بندی دیگری از همان سوال (هر دو در مکالمه جدید) ارسال می‌شود؛
+پاسخ دوم باید cached=True باشد.
+
+Usage:
+    python tools/check_semantic_cache.py
+    python tools/check_semantic_cache.py --base-url http://localhost:7001 \\
+        --query "نرخ مالیات بر ارزش افزوده چقدر است؟" \\
+        --reworded "نرخ مالیات بر ارزش افزوده چند است؟"
+
+Requires ENABLE_SEMANTIC_CACHE=true on the Core API.
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config.settings import settings
+from app.core.security import create_access_token
+
+
+async def ask(client: httpx.AsyncClient, base_url: str, token: str, query: str) -> dict:
+    """ارسال یک سوال در مکالمه جدید (بدون حافظه و فایل)"""
+    response = await client.post(
+        f"{base_url}/api/v1/query/",
+        json={"query": query, "use_cache": True},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def check(base_url: str, query: str, reworded: str) -> bool:
+    """بررسی اینکه سوال بازنویسی‌شده از Semantic Cache پاسخ داده می‌شود"""
+    print("=" * 70)
+    print("🧪 Semantic Cache Check (/api/v1/query)")
+    print("=" * 70)
+    print()
+    print(f"   ENABLE_SEMANTIC_CACHE: {settings.enable_semantic_cache}")
+    print(f"   Threshold: {settings.semantic_cache_threshold}")
+    print()
+
+    # کاربر جدید برای هر اجرا تا حافظه بلندمدت قبلی روی نتیجه اثر نگذارد
+    token = create_access_token({"sub": f"semcache-check-{uuid.uuid4().hex[:12]}"})
+
+    async with httpx.AsyncClient(timeout=120) as client:
+        first = await ask(client, base_url, token, query)
+        print(f"1️⃣  {query}")
+        print(f"   cached={first.get('cached')} | {first['processing_time_ms']}ms")
+
+        second = await ask(client, base_url, token, reworded)
+        print(f"2️⃣  {reworded}")
+        print(f"   cached={second.get('cached')} | {second['processing_time_ms']}ms")
+
+    print()
+    if second.get("cached"):
+        print("✅ Reworded query was served from the semantic cache")
+        return True
+
+    print("❌ Reworded query was NOT served from cache")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check semantic cache on /api/v1/query')
+    parser.add_argument('--base-url', default='http://localhost:7001',
+                        help='Core API base URL')
+    parser.add_argument('--query', default='نرخ مالیات بر ارزش افزوده چقدر است؟',
+                        help='Original query')
+    parser.add_argument('--reworded', default='نرخ مالیات بر ارزش افزوده چند است؟',
+                        help='Reworded query with the same meaning')
+    args = parser.parse_args()
+
+    ok = asyncio.run(check(args.base_url.rstrip('/'), args.query, args.reworded))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
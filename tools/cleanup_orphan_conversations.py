@@ -36,30 +36,25 @@ async def cleanup_orphan_conversations():
             print(f"\n📊 تعداد کل گفتگوها در Core: {total_conversations}")
             
             if total_conversations > 0:
-                # دریافت لیست گفتگوها
-                result = await session.execute(select(Conversation))
-                conversations = result.scalars().all()
+                # شمارش کل پیام‌ها با یک کوئری
+                result = await session.execute(
+                    select(func.count(Message.id)).where(
+                        Message.conversation_id.in_(select(Conversation.id))
+                    )
+                )
+                total_messages = result.scalar()
                 
-                print(f"\n🗑️  حذف {len(conversations)} گفتگوی orphan...")
+                print(f"\n🗑️  حذف {total_conversations} گفتگوی orphan...")
                 print("="*60)
                 
-                deleted_count = 0
-                total_messages = 0
-                
-                for conv in conversations:
-                    # شمارش پیام‌ها
-                    msg_result = await session.execute(
-                        select(func.count(Message.id)).where(Message.conversation_id == conv.id)
+                # حذف دسته‌ای (بدون بارگذاری تک‌تک رکوردها در ORM)
+                await session.execute(
+                    delete(Message).where(
+                        Message.conversation_id.in_(select(Conversation.id))
                     )
-                    msg_count = msg_result.scalar()
-                    total_messages += msg_count
-                    
-                    print(f"  ✓ حذف گفتگو {conv.id}")
-                    print(f"    - تعداد پیام‌ها: {msg_count}")
-                    print(f"    - تاریخ ایجاد: {conv.created_at}")
-                    
-                    await session.delete(conv)
-                    deleted_count += 1
+                )
+                result = await session.execute(delete(Conversation))
+                deleted_count = result.rowcount
                 
                 await session.commit()
                 
@@ -12,26 +12,56 @@ Usage:
     python tools/reset_qdrant_collection.py           # Interactive mode
     python tools/reset_qdrant_collection.py --force   # Non-interactive (use with caution)
     python tools/reset_qdrant_collection.py --info    # Show collection info only
+    python tools/reset_qdrant_collection.py --dim large=1024 --dim xlarge=1536
+                                                      # Create only these vector fields
+                                                      # (default: the field for EMBEDDING_DIM)
+    python tools/reset_qdrant_collection.py --all-dims
+                                                      # Create all supported vector fields
 
 IMPORTANT: This will delete ALL vectors in Qdrant!
 Make sure the ingest system is ready to re-sync all data.
 """
 
+import asyncio
 import sys
 import os
+from functools import cache
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.services.qdrant_service import QdrantService
+from app.services.qdrant_service import QdrantService, VECTOR_FIELD_SIZES, default_vector_sizes
 from app.config.settings import settings
 import structlog
 
 logger = structlog.get_logger()
 
 
-def show_info():
+@cache
+def _get_client() -> QdrantService:
+    """Shared QdrantService for the whole run (one client, one connection pool)."""
+    return QdrantService()
+
+
+def print_collection_info(info, label: str = ""):
+    """
+    Print an already-fetched CollectionInfo.
+    
+    Args:
+        info: CollectionInfo returned by (awaited) get_collection()
+        label: Prefix for each line (e.g. "Current ")
+    """
+    print(f"   {label}Points: {info.points_count}")
+    print(f"   {label}Vectors: {info.vectors_count}")
+    print(f"   {label}Status: {info.status}")
+    print()
+    print("   Vector Configs:")
+    for name, config in info.config.params.vectors.items():
+        print(f"      {name}: {config.size}d")
+
+
+async def show_info():
     """Show current collection info."""
     print("=" * 70)
     print("📊 Qdrant Collection Info")
@@ -42,56 +72,24 @@ def show_info():
     print()
     
     try:
-        qdrant = QdrantService()
-        info = qdrant.client.get_collection(settings.qdrant_collection)
-        print(f"   Points: {info.points_count}")
-        print(f"   Vectors: {info.vectors_count}")
-        print(f"   Status: {info.status}")
-        print()
-        print("   Vector Configs:")
-        for name, config in info.config.params.vectors.items():
-            print(f"      {name}: {config.size}d")
+        info = await _get_client().client.get_collection(settings.qdrant_collection)
+        print_collection_info(info)
     except Exception as e:
         print(f"   Collection not found: {e}")
     print()
 
 
-def create_collection(qdrant):
-    """Create collection with multi-dimensional support."""
-    from qdrant_client.models import Distance, VectorParams, OptimizersConfigDiff
+def parse_dim(value: str) -> tuple:
+    """Parse a NAME=SIZE vector field spec."""
+    import argparse
     
-    qdrant.client.create_collection(
-        collection_name=settings.qdrant_collection,
-        vectors_config={
-            "default": VectorParams(
-                size=3072,  # For large embedding models
-                distance=Distance.COSINE,
-            ),
-            "small": VectorParams(
-                size=512,  # Smaller models
-                distance=Distance.COSINE,
-            ),
-            "medium": VectorParams(
-                size=768,  # BERT-based models, e5-base
-                distance=Distance.COSINE,
-            ),
-            "large": VectorParams(
-                size=1024,  # e5-large, bge-m3
-                distance=Distance.COSINE,
-            ),
-            "xlarge": VectorParams(
-                size=1536,  # OpenAI ada-002, text-embedding-3-small
-                distance=Distance.COSINE,
-            ),
-        },
-        optimizers_config=OptimizersConfigDiff(
-            indexing_threshold=20000,
-            memmap_threshold=50000,
-        ),
-    )
-
-
-def main():
+    name, sep, size = value.partition("=")
+    if not sep or not name or not size.isdigit() or int(size) <= 0:
+        raise argparse.ArgumentTypeError(f"expected NAME=SIZE (e.g. large=1024), got '{value}'")
+    return name, int(size)
+
+
+async def main():
     """Delete and recreate Qdrant collection."""
     import argparse
     
@@ -100,11 +98,26 @@ def main():
                         help='Skip confirmation prompt')
     parser.add_argument('--info', '-i', action='store_true',
                         help='Show collection info only')
+    parser.add_argument('--dim', action='append', type=parse_dim, metavar='NAME=SIZE',
+                        help='Vector field to create (repeatable, default: field for EMBEDDING_DIM)')
+    parser.add_argument('--all-dims', action='store_true',
+                        help='Create all supported vector fields (small/medium/large/xlarge/default)')
+    parser.add_argument('--indexing-threshold', type=int, default=None,
+                        help='Optimizer indexing threshold (default: QDRANT_INDEXING_THRESHOLD)')
+    parser.add_argument('--memmap-threshold', type=int, default=None,
+                        help='Optimizer memmap threshold (default: QDRANT_MEMMAP_THRESHOLD)')
     args = parser.parse_args()
     
+    if args.all_dims:
+        vectors = dict(VECTOR_FIELD_SIZES)
+    elif args.dim:
+        vectors = dict(args.dim)
+    else:
+        vectors = default_vector_sizes()
+    
     # Info only mode
     if args.info:
-        show_info()
+        await show_info()
         return
     
     print("=" * 70)
@@ -127,41 +140,43 @@ def main():
     
     print()
     print("Initializing Qdrant service...")
-    qdrant = QdrantService()
+    qdrant = _get_client()
     
     try:
         # Get current collection info
         print(f"📊 Checking current collection status...")
         try:
-            info = qdrant.client.get_collection(settings.qdrant_collection)
-            print(f"   Current points count: {info.points_count}")
-            print(f"   Current vectors count: {info.vectors_count}")
-            print(f"   Current status: {info.status}")
+            info = await qdrant.client.get_collection(settings.qdrant_collection)
+            print_collection_info(info, "Current ")
         except Exception as e:
             print(f"   Collection does not exist or error: {e}")
         
         print()
         print("🗑️  Deleting collection...")
-        qdrant.client.delete_collection(collection_name=settings.qdrant_collection)
+        await qdrant.client.delete_collection(collection_name=settings.qdrant_collection)
         print("✅ Collection deleted successfully!")
         
         print()
-        print("🛠️  Creating new collection with multi-dimensional support...")
-        print("   Supported dimensions:")
-        print("      - small: 512")
-        print("      - medium: 768")
-        print("      - large: 1024  ← e5-large (default)")
-        print("      - xlarge: 1536")
-        print("      - default: 3072")
+        print("🛠️  Creating new collection...")
+        print("   Vector fields:")
+        for name, size in vectors.items():
+            print(f"      - {name}: {size}")
         
-        create_collection(qdrant)
+        await qdrant.create_collection(
+            vectors,
+            indexing_threshold=args.indexing_threshold,
+            memmap_threshold=args.memmap_threshold
+        )
         print("✅ Collection created successfully!")
         
+        print("🗂️  Creating payload indexes...")
+        await qdrant.create_indexes()
+        print("✅ Payload indexes created!")
+        
         print()
         print("📊 New collection info:")
-        info = qdrant.client.get_collection(settings.qdrant_collection)
-        print(f"   Status: {info.status}")
-        print(f"   Points count: {info.points_count}")
+        info = await qdrant.client.get_collection(settings.qdrant_collection)
+        print_collection_info(info)
         
         print()
         print("=" * 70)
@@ -169,7 +184,8 @@ def main():
         print("=" * 70)
         print()
         print("Next steps:")
-        print("1. Make sure the ingest system is configured with e5-large model")
+        fields = ", ".join(f"{name} ({size}d)" for name, size in vectors.items())
+        print(f"1. Make sure the ingest system embeds with a model matching: {fields}")
         print("2. Re-embed all chunks in the ingest system")
         print("3. Sync all embeddings to Core using: POST /api/v1/sync/embeddings")
         print()
@@ -184,4 +200,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
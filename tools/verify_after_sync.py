@@ -3,6 +3,7 @@
 Quick verification after sync completes
 """
 
+import asyncio
 import sys
 import os
 from pathlib import Path
@@ -12,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from app.services.qdrant_service import QdrantService
 
 
-def main():
+async def main():
     qdrant = QdrantService()
     
     print("=" * 70)
@@ -21,10 +22,14 @@ def main():
     print()
     
     # Get collection info
-    info = qdrant.client.get_collection(qdrant.collection_name)
+    info = await qdrant.client.get_collection(qdrant.collection_name)
     
     expected = 4304
-    actual = info.points_count
+    # شمارش دقیق (points_count در collection info با تأخیر به‌روز می‌شود)
+    actual = (await qdrant.client.count(
+        collection_name=qdrant.collection_name,
+        exact=True
+    )).count
     diff = actual - expected
     
     print(f"Expected: {expected}")
@@ -43,27 +48,24 @@ def main():
     print()
     print(f"Collection Status: {info.status}")
     
-    # Sample check
+    # Sample check (فقط یک نقطه؛ انتقال بردارهای بیشتر لازم نیست)
     print()
     print("Checking sample data...")
-    samples = qdrant.client.scroll(
+    samples, _ = await qdrant.client.scroll(
         collection_name=qdrant.collection_name,
-        limit=10,
+        limit=1,
         with_payload=True,
         with_vectors=True
-    )[0]
+    )
     
     if samples:
-        # Check vector field
-        vector_fields = set()
-        for point in samples:
-            if hasattr(point, 'vector') and point.vector:
-                vector_fields.update(point.vector.keys())
+        first = samples[0]
         
-        print(f"Vector fields used: {', '.join(vector_fields)}")
+        # Check vector field
+        if hasattr(first, 'vector') and first.vector:
+            print(f"Vector fields used: {', '.join(first.vector.keys())}")
         
         # Check first point
-        first = samples[0]
         if hasattr(first, 'vector') and first.vector:
             for field, vec in first.vector.items():
                 print(f"Sample dimension: {len(vec)}d ({field})")
@@ -90,4 +92,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())